@@ -1,9 +1,13 @@
 """AI Chatbot engine for conversational meal and workout planning."""
 
 import json
+import logging
 import re
+import time
 from datetime import date
-from typing import Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from nutrifit.engines.llm_engine import LocalLLMEngine
 from nutrifit.engines.meal_planner import MealPlannerEngine
@@ -22,6 +26,92 @@ try:
 except ImportError:
     OllamaEngine = None
 
+logger = logging.getLogger(__name__)
+
+
+def _keyword_pattern(*keywords: str) -> re.Pattern[str]:
+    """Compile a pattern matching any keyword as a substring."""
+    return re.compile("|".join(re.escape(kw) for kw in keywords))
+
+
+# Intent keyword groups, compiled once and matched against lowercased messages
+_SHOW_RE = _keyword_pattern("show", "see", "view", "display")
+_FULL_RE = _keyword_pattern("full", "complete", "entire", "whole", "all")
+_PLAN_SUBJECT_RE = _keyword_pattern("plan", "meal", "workout")
+_AFFIRMATIVES = frozenset(
+    ["yes", "yeah", "yep", "sure", "ok", "okay", "show me", "yes please"]
+)
+_CREATE_RE = _keyword_pattern("create", "generate", "make", "plan")
+_MEAL_RE = _keyword_pattern(
+    "meal plan", "meal", "food", "recipe", "eat", "breakfast", "lunch", "dinner"
+)
+_WORKOUT_RE = _keyword_pattern("workout", "exercise", "training", "fitness", "gym")
+_MODIFY_RE = _keyword_pattern("change", "modify", "replace", "swap", "different")
+_QUESTION_RE = _keyword_pattern("what", "how", "why", "when", "should", "?")
+_NUTRITION_RE = _keyword_pattern("calorie", "protein", "carb", "fat", "nutrition", "diet")
+_PROFILE_RE = _keyword_pattern("i am", "i'm", "my goal", "i want", "i need", "allergic")
+
+
+# Intent detection only depends on the message text and whether a plan is in
+# context, so repeated messages skip the keyword scans
+@lru_cache(maxsize=2048)
+def _detect_intent_impl(message: str, has_plan: bool) -> str:
+    """Detect the intent of a message.
+
+    Args:
+        message: User message
+        has_plan: Whether a meal or workout plan is in the conversation context
+
+    Returns:
+        Intent label
+    """
+    message_lower = message.lower()
+
+    # Show full plan (when user has a plan in context)
+    if _SHOW_RE.search(message_lower) and _FULL_RE.search(message_lower):
+        if _PLAN_SUBJECT_RE.search(message_lower):
+            # If they have a plan in context, show it
+            if has_plan:
+                return "show_full_plan"
+            # Otherwise, treat as a request to create a plan
+            # Fall through to meal/workout plan request detection
+
+    # Also detect simple affirmative responses after showing preview
+    if message_lower in _AFFIRMATIVES and has_plan:
+        return "show_full_plan"
+
+    wants_plan = _CREATE_RE.search(message_lower)
+    mentions_meal = _MEAL_RE.search(message_lower)
+    mentions_workout = _WORKOUT_RE.search(message_lower)
+
+    # Meal plan requests
+    if wants_plan and mentions_meal:
+        return "meal_plan_request"
+
+    # Workout plan requests
+    if wants_plan and mentions_workout:
+        return "workout_plan_request"
+
+    # Modifications
+    if _MODIFY_RE.search(message_lower):
+        if mentions_meal:
+            return "modify_meal"
+        if mentions_workout:
+            return "modify_workout"
+
+    # Questions
+    if _QUESTION_RE.search(message_lower):
+        if _NUTRITION_RE.search(message_lower):
+            return "nutrition_question"
+        if mentions_workout:
+            return "workout_question"
+
+    # Profile updates
+    if _PROFILE_RE.search(message_lower):
+        return "profile_update"
+
+    return "general"
+
 
 class ChatbotEngine:
     """
@@ -97,13 +187,16 @@ class ChatbotEngine:
         print("⚠️ Using LocalLLMEngine (GPT-2 or templates) - Consider installing Ollama for better responses")
         return LocalLLMEngine()
     
-    def _generate_with_retry(self, operation, operation_name: str, max_retries: int = 2):
+    def _generate_with_retry(
+        self, operation, operation_name: str, max_retries: int = 2, sleep_fn=time.sleep
+    ):
         """Execute an operation with retry logic for transient failures.
         
         Args:
             operation: Callable that performs the operation
             operation_name: Name of the operation for logging
             max_retries: Maximum number of retry attempts
+            sleep_fn: Called with the backoff delay in seconds before each retry
             
         Returns:
             Result of the operation
@@ -111,21 +204,22 @@ class ChatbotEngine:
         Raises:
             Exception: If all retries fail
         """
-        import time
-        
         last_exception = None
         for attempt in range(max_retries + 1):
             try:
                 if attempt > 0:
                     # Wait before retry (exponential backoff)
                     wait_time = 2 ** attempt
-                    print(f"[CHATBOT] Retrying {operation_name} (attempt {attempt + 1}/{max_retries + 1}) after {wait_time}s...")
-                    time.sleep(wait_time)
+                    logger.info(
+                        "Retrying %s (attempt %d/%d) after %ds...",
+                        operation_name, attempt + 1, max_retries + 1, wait_time
+                    )
+                    sleep_fn(wait_time)
                 
                 result = operation()
                 
                 if attempt > 0:
-                    print(f"[CHATBOT] {operation_name} succeeded on retry {attempt}")
+                    logger.info("%s succeeded on retry %d", operation_name, attempt)
                 
                 return result
                 
@@ -139,12 +233,12 @@ class ChatbotEngine:
                 ])
                 
                 if attempt < max_retries and is_transient:
-                    print(f"[CHATBOT] {operation_name} failed with transient error: {error_msg}")
+                    logger.warning("%s failed with transient error: %s", operation_name, error_msg)
                     continue
                 else:
                     # Non-transient error or max retries reached
                     if attempt >= max_retries:
-                        print(f"[CHATBOT] {operation_name} failed after {max_retries + 1} attempts")
+                        logger.error("%s failed after %d attempts", operation_name, max_retries + 1)
                     raise
         
         # Should never reach here, but just in case
@@ -272,54 +366,19 @@ class ChatbotEngine:
 
     def _detect_intent(self, message: str) -> str:
         """Detect the user's intent from their message."""
-        message_lower = message.lower()
+        has_plan = "meal_plan" in self.current_context or "workout_plan" in self.current_context
+        return _detect_intent_impl(message, has_plan)
 
-        # Show full plan (when user has a plan in context)
-        if any(kw in message_lower for kw in ["show", "see", "view", "display"]):
-            if any(kw in message_lower for kw in ["full", "complete", "entire", "whole", "all"]):
-                if any(kw in message_lower for kw in ["plan", "meal", "workout"]):
-                    # If they have a plan in context, show it
-                    if "meal_plan" in self.current_context or "workout_plan" in self.current_context:
-                        return "show_full_plan"
-                    # Otherwise, treat as a request to create a plan
-                    # Fall through to meal/workout plan request detection
-        
-        # Also detect simple affirmative responses after showing preview
-        if message_lower in ["yes", "yeah", "yep", "sure", "ok", "okay", "show me", "yes please"]:
-            if "meal_plan" in self.current_context or "workout_plan" in self.current_context:
-                return "show_full_plan"
+    def detect_intent_batch(self, messages: list[str]) -> list[str]:
+        """Detect the intent of several messages.
+
+        Args:
+            messages: User messages
 
-        # Meal plan requests
-        meal_keywords = ["meal plan", "meal", "food", "recipe", "eat", "breakfast", "lunch", "dinner"]
-        if any(kw in message_lower for kw in ["create", "generate", "make", "plan"]):
-            if any(kw in message_lower for kw in meal_keywords):
-                return "meal_plan_request"
-
-        # Workout plan requests
-        workout_keywords = ["workout", "exercise", "training", "fitness", "gym"]
-        if any(kw in message_lower for kw in ["create", "generate", "make", "plan"]):
-            if any(kw in message_lower for kw in workout_keywords):
-                return "workout_plan_request"
-
-        # Modifications
-        if any(kw in message_lower for kw in ["change", "modify", "replace", "swap", "different"]):
-            if any(kw in message_lower for kw in meal_keywords):
-                return "modify_meal"
-            if any(kw in message_lower for kw in workout_keywords):
-                return "modify_workout"
-
-        # Questions
-        if any(kw in message_lower for kw in ["what", "how", "why", "when", "should", "?"]):
-            if any(kw in message_lower for kw in ["calorie", "protein", "carb", "fat", "nutrition", "diet"]):
-                return "nutrition_question"
-            if any(kw in message_lower for kw in workout_keywords):
-                return "workout_question"
-
-        # Profile updates
-        if any(kw in message_lower for kw in ["i am", "i'm", "my goal", "i want", "i need", "allergic"]):
-            return "profile_update"
-
-        return "general"
+        Returns:
+            One intent label per message, in order
+        """
+        return list(map(self._detect_intent, messages))
 
     def _handle_meal_plan_request(self, message: str) -> dict[str, Any]:
         """Handle meal plan generation requests.
@@ -1160,9 +1219,19 @@ Keep it brief and conversational."""
         """Get the full conversation history."""
         return self.conversation_history.copy()
 
-    def export_context(self) -> dict[str, Any]:
-        """Export the current context (meal plans, workout plans, etc.)."""
-        return self.current_context.copy()
+    def export_context(self, copy: bool = False) -> Mapping[str, Any]:
+        """Export the current context (meal plans, workout plans, etc.).
+
+        Args:
+            copy: If True, return a detached dict snapshot instead of a
+                read-only view of the live context.
+
+        Returns:
+            Read-only mapping over the context, or a dict copy if requested
+        """
+        if copy:
+            return dict(self.current_context)
+        return MappingProxyType(self.current_context)
 
     def generate_llm_meal_plan(
         self,
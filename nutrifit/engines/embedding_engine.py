@@ -1,11 +1,165 @@
 """Embedding engine for semantic search and matching."""
 
 import hashlib
+import os
 import re
+import sqlite3
+import threading
+import zlib
+from functools import lru_cache
 from pathlib import Path
 
 import numpy as np
 
+# Optional SIMD-accelerated distance kernels
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+# Optional vector index for top-k search over larger corpora
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# File name of the SQLite disk cache inside the cache directory
+CACHE_DB_NAME = "cache.db"
+
+# Files written by the pre-SQLite disk cache: an md5 hex digest plus .npy
+_LEGACY_CACHE_FILE_RE = re.compile(r"[0-9a-f]{32}\.npy")
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return the indices of the ``k`` highest scores, best first.
+
+    Only the selected entries are sorted. Equal scores keep their input
+    order, so the result matches a stable descending sort.
+
+    Args:
+        scores: 1-D array of scores
+        k: Number of indices to return
+
+    Returns:
+        Array of at most ``k`` indices into ``scores``
+    """
+    n = scores.shape[0]
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+
+    threshold = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > threshold)
+    tied = np.flatnonzero(scores == threshold)[: k - above.size]
+    selected = np.concatenate((above, tied))
+    return selected[np.argsort(-scores[selected], kind="stable")]
+
+
+class _OnnxSentenceEncoder:
+    """Sentence encoder running a quantized ONNX export on ONNX Runtime.
+
+    Mirrors the ``encode`` method of ``SentenceTransformer`` so the engine
+    can use either interchangeably: token embeddings are mean-pooled over
+    the attention mask and L2-normalized, like the original model.
+    """
+
+    # AVX-512 VNNI int8 export shipped in the model's Hugging Face repo
+    ONNX_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+    MAX_SEQ_LENGTH = 256
+
+    def __init__(self, model_name: str):
+        """Load the quantized model and its tokenizer.
+
+        Args:
+            model_name: sentence-transformers model name
+
+        Raises:
+            ImportError: If onnxruntime, tokenizers or huggingface_hub is missing
+            OSError: If the model files cannot be found, downloaded or parsed
+            RuntimeError: If ONNX Runtime cannot load the model
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        repo_id = f"sentence-transformers/{model_name}"
+        model_path = self._resolve_file(repo_id, self.ONNX_FILE)
+        tokenizer_path = self._resolve_file(repo_id, "tokenizer.json")
+
+        self._session = ort.InferenceSession(
+            model_path, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self._session.get_inputs()}
+        try:
+            self._tokenizer = Tokenizer.from_file(tokenizer_path)
+        except Exception as e:
+            # tokenizers raises a bare Exception for unreadable or
+            # incompatible files; surface it as the documented OSError
+            raise OSError(f"Failed to load tokenizer {tokenizer_path}: {e}") from e
+        self._tokenizer.enable_truncation(max_length=self.MAX_SEQ_LENGTH)
+        self._tokenizer.enable_padding()
+
+    @staticmethod
+    def _resolve_file(repo_id: str, filename: str) -> str:
+        """Return the local path of a model file, downloading it only if needed.
+
+        The Hugging Face cache is checked first so that a model which is
+        already on disk loads without a network round trip; with
+        HF_HUB_OFFLINE set, a miss raises instead of downloading.
+        """
+        from huggingface_hub import hf_hub_download
+
+        try:
+            return hf_hub_download(repo_id, filename, local_files_only=True)
+        except FileNotFoundError:
+            # LocalEntryNotFoundError: not in the local cache yet
+            return hf_hub_download(repo_id, filename)
+
+    def encode(
+        self, sentences: str | list[str], convert_to_numpy: bool = True
+    ) -> np.ndarray:
+        """Embed one sentence or a list of sentences.
+
+        Args:
+            sentences: Text or list of texts
+            convert_to_numpy: Accepted for SentenceTransformer compatibility
+
+        Returns:
+            A 1-D vector for a single text, otherwise one row per text
+        """
+        single = isinstance(sentences, str)
+        encodings = self._tokenizer.encode_batch([sentences] if single else sentences)
+
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array(
+                [e.attention_mask for e in encodings], dtype=np.int64
+            ),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        inputs = {name: value for name, value in inputs.items() if name in self._input_names}
+        token_embeddings = self._session.run(None, inputs)[0]
+
+        # Mean pooling over real (non-padding) tokens
+        mask = inputs["attention_mask"][..., None].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        embeddings = summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.clip(norms, 1e-12, None)
+
+        return embeddings[0] if single else embeddings
+
+
+@lru_cache(maxsize=None)
+def _load_onnx_encoder(model_name: str) -> _OnnxSentenceEncoder:
+    """Load the ONNX encoder for a model once per process.
+
+    Every EmbeddingEngine (the planners, the chatbot and each test) shares
+    the same session and tokenizer; failures raise and are not cached.
+    """
+    return _OnnxSentenceEncoder(model_name)
+
 
 class EmbeddingEngine:
     """
@@ -25,14 +179,34 @@ class EmbeddingEngine:
 
         Args:
             cache_dir: Directory for caching embeddings. Defaults to ~/.nutrifit/embeddings
-            max_cache_size_mb: Maximum disk cache size in MB (default: 100)
+            max_cache_size_mb: Maximum disk cache size in MB, measured as the
+                database and write-ahead log files on disk (default: 100)
             max_memory_cache_items: Maximum number of items in memory cache (default: 1000)
         """
         self.cache_dir = cache_dir or Path.home() / ".nutrifit" / "embeddings"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self._embeddings_cache: dict[str, np.ndarray] = {}
         self._max_cache_size_mb = max_cache_size_mb
         self._max_memory_cache_items = max_memory_cache_items
+
+        # In-memory cache: one contiguous float32 matrix (allocated on first
+        # insert, once the embedding dimension is known) plus a key -> row
+        # index. Dict insertion order doubles as FIFO eviction order.
+        self._embeddings_cache: dict[str, int] = {}
+        self._cache_matrix: np.ndarray | None = None
+        self._cache_free_rows: list[int] = list(range(max_memory_cache_items))
+
+        # Disk cache: a single SQLite database in cache_dir holding one
+        # float32 blob per key. The running total of stored vector bytes is
+        # kept up to date on every write and delete. The web app shares one
+        # engine across request threads, so the connection, its explicit
+        # transactions, the byte total and the memory cache above are only
+        # touched under _lock.
+        self._lock = threading.RLock()
+        self._db: sqlite3.Connection | None = None
+        self._db_path: Path | None = None
+        self._disk_bytes = 0
+        self._get_db()
+
         self._model = None
         self._model_name = "all-MiniLM-L6-v2"
         self._use_transformer = False
@@ -41,10 +215,17 @@ class EmbeddingEngine:
         self._initialize_model()
 
     def _initialize_model(self) -> None:
-        """Initialize the embedding model."""
-        # Always initialize vocab for fallback mode
-        self._vocab: dict[str, int] = {}
-        self._idf: dict[str, float] = {}
+        """Initialize the embedding model.
+
+        Prefers the int8-quantized ONNX export on ONNX Runtime, then
+        sentence-transformers, then the built-in fallback embeddings.
+        """
+        try:
+            self._model = _load_onnx_encoder(self._model_name)
+            self._use_transformer = True
+            return
+        except (ImportError, OSError, RuntimeError):
+            pass
 
         try:
             from sentence_transformers import SentenceTransformer
@@ -57,7 +238,7 @@ class EmbeddingEngine:
 
     def _get_cache_key(self, text: str) -> str:
         """Generate cache key for text."""
-        return hashlib.md5(text.encode()).hexdigest()
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
 
     def _simple_tokenize(self, text: str) -> list[str]:
         """Simple tokenization for fallback embeddings."""
@@ -67,30 +248,168 @@ class EmbeddingEngine:
         return tokens
 
     def _simple_embed(self, text: str) -> np.ndarray:
-        """Generate simple bag-of-words style embedding."""
-        tokens = self._simple_tokenize(text)
+        """Generate simple bag-of-words style embedding.
 
-        # Update vocabulary
-        for token in tokens:
-            if token not in self._vocab:
-                self._vocab[token] = len(self._vocab)
+        Tokens are hashed into a fixed number of buckets (the hashing trick),
+        so the same text always maps to the same vector regardless of what
+        was embedded before, and the counting runs in a single NumPy call.
+        """
+        tokens = self._simple_tokenize(text)
 
-        # Create embedding vector (using word frequency)
         # Limit dimension to 384 to match transformer output
         dim = 384
-        embedding = np.zeros(dim)
+        if not tokens:
+            return np.zeros(dim)
 
-        for token in tokens:
-            idx = self._vocab.get(token, 0) % dim
-            embedding[idx] += 1.0
+        # crc32 is stable across processes, unlike the builtin hash()
+        buckets = np.fromiter(
+            (zlib.crc32(token.encode()) for token in tokens),
+            dtype=np.uint32,
+            count=len(tokens),
+        ) % dim
+        embedding = np.bincount(buckets, minlength=dim).astype(np.float64)
 
         # Normalize
-        norm = np.linalg.norm(embedding)
-        if norm > 0:
-            embedding = embedding / norm
+        embedding /= np.linalg.norm(embedding)
 
         return embedding
 
+    def _get_cached(self, cache_key: str) -> np.ndarray | None:
+        """Look up an embedding in the in-memory cache."""
+        with self._lock:
+            row = self._embeddings_cache.get(cache_key)
+            if row is None or self._cache_matrix is None:
+                return None
+            # Copy so callers never hold a view onto a row that may be reused
+            return self._cache_matrix[row].copy()
+
+    def _set_cached(self, cache_key: str, embedding: np.ndarray) -> None:
+        """Store an embedding in the in-memory cache, evicting the oldest entry if full."""
+        if self._max_memory_cache_items <= 0:
+            return
+
+        # Claiming a row, indexing it and filling it must not interleave with
+        # another thread's insert or read of the same row
+        with self._lock:
+            if self._cache_matrix is None:
+                self._cache_matrix = np.empty(
+                    (self._max_memory_cache_items, len(embedding)), dtype=np.float32
+                )
+
+            row = self._embeddings_cache.get(cache_key)
+            if row is None:
+                if not self._cache_free_rows:
+                    oldest_key = next(iter(self._embeddings_cache))
+                    self._cache_free_rows.append(self._embeddings_cache.pop(oldest_key))
+                row = self._cache_free_rows.pop()
+                self._embeddings_cache[cache_key] = row
+
+            self._cache_matrix[row] = embedding
+
+    def _get_db(self) -> sqlite3.Connection:
+        """Get the disk cache connection, reopening it if cache_dir changed."""
+        with self._lock:
+            db_path = self.cache_dir / CACHE_DB_NAME
+            if self._db is None or self._db_path != db_path:
+                if self._db is not None:
+                    self._db.close()
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                is_new = not db_path.exists()
+
+                # Autocommit mode; WAL keeps readers and the writer from blocking
+                db = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+                if is_new:
+                    # Lets evictions hand pages back to the filesystem; SQLite
+                    # only accepts this before the first table is created
+                    db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings "
+                    "(key TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+                )
+                self._db = db
+                self._db_path = db_path
+                self._disk_bytes = db.execute(
+                    "SELECT COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings"
+                ).fetchone()[0]
+                if is_new:
+                    self._remove_legacy_cache_files()
+            return self._db
+
+    def _remove_legacy_cache_files(self) -> None:
+        """Delete the per-text .npy files left by the pre-SQLite disk cache.
+
+        They are neither read nor counted against max_cache_size_mb any more,
+        so leaving them would let the cache directory grow past its limit.
+        Only names the old cache generated (an md5 hex digest) are removed,
+        since cache_dir may also hold the caller's own .npy files.
+        """
+        for cache_file in self.cache_dir.glob("*.npy"):
+            if not _LEGACY_CACHE_FILE_RE.fullmatch(cache_file.name):
+                continue
+            try:
+                cache_file.unlink()
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """Close the disk cache connection.
+
+        The engine stays usable: the next cache access reopens it.
+        """
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+                self._db_path = None
+
+    def __enter__(self) -> "EmbeddingEngine":
+        """Return the engine for use in a with block."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the disk cache connection on leaving a with block."""
+        self.close()
+
+    def _load_from_disk(self, cache_key: str) -> np.ndarray | None:
+        """Load a cached embedding from disk, or None if it is not stored."""
+        with self._lock:
+            row = self._get_db().execute(
+                "SELECT vec FROM embeddings WHERE key = ?", (cache_key,)
+            ).fetchone()
+            if row is None:
+                return None
+            return np.frombuffer(row[0], dtype=np.float32).copy()
+
+    def _save_to_disk(self, entries: list[tuple[str, np.ndarray]]) -> None:
+        """Write embeddings to the disk cache in one transaction.
+
+        Args:
+            entries: (cache key, embedding) pairs
+        """
+        with self._lock:
+            db = self._get_db()
+            db.execute("BEGIN")
+            try:
+                for cache_key, embedding in entries:
+                    blob = np.asarray(embedding, dtype=np.float32).tobytes()
+                    previous = db.execute(
+                        "SELECT LENGTH(vec) FROM embeddings WHERE key = ?", (cache_key,)
+                    ).fetchone()
+                    db.execute(
+                        "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                        (cache_key, blob),
+                    )
+                    self._disk_bytes += len(blob) - (previous[0] if previous else 0)
+                db.execute("COMMIT")
+            except sqlite3.Error:
+                db.execute("ROLLBACK")
+                self._disk_bytes = db.execute(
+                    "SELECT COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings"
+                ).fetchone()[0]
+                raise
+
     def embed(self, text: str, use_cache: bool = True) -> np.ndarray:
         """Generate embedding for text.
 
@@ -104,26 +423,30 @@ class EmbeddingEngine:
         cache_key = self._get_cache_key(text)
 
         # Check in-memory cache first
-        if use_cache and cache_key in self._embeddings_cache:
-            return self._embeddings_cache[cache_key]
+        if use_cache:
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                return cached
 
         # Check disk cache
-        cache_file = self.cache_dir / f"{cache_key}.npy"
-        if use_cache and cache_file.exists():
-            embedding = np.load(cache_file)
-            self._embeddings_cache[cache_key] = embedding
-            return embedding
+        if use_cache:
+            embedding = self._load_from_disk(cache_key)
+            if embedding is not None:
+                self._set_cached(cache_key, embedding)
+                return embedding
 
         # Generate embedding
         if self._use_transformer and self._model is not None:
             embedding = self._model.encode(text, convert_to_numpy=True)
         else:
             embedding = self._simple_embed(text)
+        # Both caches store float32, so return that on a miss too
+        embedding = np.asarray(embedding, dtype=np.float32)
 
         # Cache the embedding only if use_cache is True
         if use_cache:
-            self._embeddings_cache[cache_key] = embedding
-            np.save(cache_file, embedding)
+            self._set_cached(cache_key, embedding)
+            self._save_to_disk([(cache_key, embedding)])
 
             # Enforce cache limits
             self._enforce_cache_limits()
@@ -147,17 +470,16 @@ class EmbeddingEngine:
         # Check cache for each text
         for i, text in enumerate(texts):
             cache_key = self._get_cache_key(text)
-            if use_cache and cache_key in self._embeddings_cache:
-                embeddings.append((i, self._embeddings_cache[cache_key]))
+            cached = self._get_cached(cache_key) if use_cache else None
+            if cached is None and use_cache:
+                cached = self._load_from_disk(cache_key)
+                if cached is not None:
+                    self._set_cached(cache_key, cached)
+            if cached is not None:
+                embeddings.append((i, cached))
             else:
-                cache_file = self.cache_dir / f"{cache_key}.npy"
-                if use_cache and cache_file.exists():
-                    embedding = np.load(cache_file)
-                    self._embeddings_cache[cache_key] = embedding
-                    embeddings.append((i, embedding))
-                else:
-                    texts_to_embed.append(text)
-                    indices_to_embed.append(i)
+                texts_to_embed.append(text)
+                indices_to_embed.append(i)
 
         # Batch embed remaining texts
         if texts_to_embed:
@@ -169,20 +491,22 @@ class EmbeddingEngine:
                 new_embeddings = np.array(
                     [self._simple_embed(t) for t in texts_to_embed]
                 )
+            new_embeddings = np.asarray(new_embeddings, dtype=np.float32)
 
             # Cache and add to results
+            to_save = {}
             for idx, text, embedding in zip(
                 indices_to_embed, texts_to_embed, new_embeddings, strict=False
             ):
-                cache_key = self._get_cache_key(text)
                 if use_cache:
-                    self._embeddings_cache[cache_key] = embedding
-                    cache_file = self.cache_dir / f"{cache_key}.npy"
-                    np.save(cache_file, embedding)
+                    cache_key = self._get_cache_key(text)
+                    self._set_cached(cache_key, embedding)
+                    to_save[cache_key] = embedding
                 embeddings.append((idx, embedding))
 
-            # Enforce cache limits after batch operation
+            # Persist the whole batch and enforce cache limits afterwards
             if use_cache:
+                self._save_to_disk(list(to_save.items()))
                 self._enforce_cache_limits()
 
         # Sort by original index and stack
@@ -201,12 +525,19 @@ class EmbeddingEngine:
         Returns:
             Cosine similarity score (0-1)
         """
-        norm1 = np.linalg.norm(embedding1)
-        norm2 = np.linalg.norm(embedding2)
-
-        if norm1 == 0 or norm2 == 0:
+        if not np.any(embedding1) or not np.any(embedding2):
             return 0.0
 
+        if simsimd is not None:
+            # simsimd returns the cosine distance, not the similarity
+            distance = simsimd.cosine(
+                np.ascontiguousarray(embedding1, dtype=np.float32),
+                np.ascontiguousarray(embedding2, dtype=np.float32),
+            )
+            return float(1.0 - distance)
+
+        norm1 = np.linalg.norm(embedding1)
+        norm2 = np.linalg.norm(embedding2)
         return float(np.dot(embedding1, embedding2) / (norm1 * norm2))
 
     def find_similar(
@@ -227,25 +558,57 @@ class EmbeddingEngine:
         Returns:
             List of tuples (index, id/text, similarity_score)
         """
+        if not items or top_k <= 0:
+            return []
+
         query_embedding = self.embed(query)
         item_embeddings = self.embed_batch(items)
+        top_k = min(top_k, len(items))
 
-        similarities = []
-        for i, item_emb in enumerate(item_embeddings):
-            sim = self.similarity(query_embedding, item_emb)
-            item_id = item_ids[i] if item_ids else items[i]
-            similarities.append((i, item_id, sim))
-
-        # Sort by similarity descending
-        similarities.sort(key=lambda x: x[2], reverse=True)
+        query_vector = self._normalize_rows(
+            np.asarray(query_embedding, dtype=np.float32).reshape(1, -1)
+        )
 
-        return similarities[:top_k]
+        if faiss is not None:
+            index = self._build_faiss_index(item_embeddings)
+            scores, indices = index.search(query_vector, top_k)
+            ranked = zip(indices[0], scores[0], strict=True)
+        else:
+            item_matrix = self._normalize_rows(item_embeddings.astype(np.float32))
+            scores = item_matrix @ query_vector[0]
+            order = top_k_indices(scores, top_k)
+            ranked = zip(order, scores[order], strict=True)
+
+        return [
+            (int(i), item_ids[i] if item_ids else items[i], float(score))
+            for i, score in ranked
+        ]
+
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """L2-normalize each row, leaving all-zero rows as zeros."""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _build_faiss_index(self, item_embeddings: np.ndarray):
+        """Build an inner-product FAISS index over the normalized item embeddings."""
+        item_matrix = np.ascontiguousarray(
+            self._normalize_rows(item_embeddings.astype(np.float32))
+        )
+        index = faiss.IndexFlatIP(item_matrix.shape[1])
+        index.add(item_matrix)
+        return index
 
     def clear_cache(self) -> None:
         """Clear all cached embeddings."""
-        self._embeddings_cache.clear()
-        for cache_file in self.cache_dir.glob("*.npy"):
-            cache_file.unlink()
+        with self._lock:
+            self._embeddings_cache.clear()
+            self._cache_free_rows = list(range(self._max_memory_cache_items))
+            db = self._get_db()
+            db.execute("DELETE FROM embeddings")
+            db.execute("PRAGMA incremental_vacuum")
+            self._disk_bytes = 0
 
     def get_cache_size_mb(self) -> float:
         """Get current disk cache size in MB.
@@ -253,10 +616,23 @@ class EmbeddingEngine:
         Returns:
             Cache size in megabytes
         """
-        total_size = sum(
-            f.stat().st_size for f in self.cache_dir.glob("*.npy") if f.is_file()
-        )
-        return total_size / (1024 * 1024)
+        return self._disk_usage_bytes() / (1024 * 1024)
+
+    def _disk_usage_bytes(self) -> int:
+        """Bytes the disk cache occupies: the database file plus its WAL file.
+
+        Unlike the stored vector bytes in ``_disk_bytes``, this includes page
+        and index overhead, free pages and the write-ahead log.
+        """
+        with self._lock:
+            self._get_db()
+            total = 0
+            for suffix in ("", "-wal"):
+                try:
+                    total += os.stat(f"{self._db_path}{suffix}").st_size
+                except FileNotFoundError:
+                    pass
+            return total
 
     def get_cache_stats(self) -> dict[str, int | float]:
         """Get cache statistics.
@@ -264,39 +640,54 @@ class EmbeddingEngine:
         Returns:
             Dictionary with cache statistics
         """
-        disk_files = list(self.cache_dir.glob("*.npy"))
-        return {
-            "memory_cache_items": len(self._embeddings_cache),
-            "disk_cache_files": len(disk_files),
-            "disk_cache_size_mb": self.get_cache_size_mb(),
-            "max_cache_size_mb": self._max_cache_size_mb,
-            "max_memory_cache_items": self._max_memory_cache_items,
-        }
+        with self._lock:
+            disk_entries = self._get_db().execute(
+                "SELECT COUNT(*) FROM embeddings"
+            ).fetchone()[0]
+            return {
+                "memory_cache_items": len(self._embeddings_cache),
+                "disk_cache_files": disk_entries,
+                "disk_cache_size_mb": self.get_cache_size_mb(),
+                "max_cache_size_mb": self._max_cache_size_mb,
+                "max_memory_cache_items": self._max_memory_cache_items,
+            }
 
     def _enforce_cache_limits(self) -> None:
-        """Enforce cache size limits by removing oldest entries."""
-        # Enforce memory cache limit
-        if len(self._embeddings_cache) > self._max_memory_cache_items:
-            # Remove oldest entries (simple FIFO)
-            items_to_remove = (
-                len(self._embeddings_cache) - self._max_memory_cache_items
-            )
-            keys_to_remove = list(self._embeddings_cache.keys())[:items_to_remove]
-            for key in keys_to_remove:
-                del self._embeddings_cache[key]
-
-        # Enforce disk cache limit
-        current_size_mb = self.get_cache_size_mb()
-        if current_size_mb > self._max_cache_size_mb:
-            # Remove oldest files by modification time
-            cache_files = sorted(
-                self.cache_dir.glob("*.npy"), key=lambda f: f.stat().st_mtime
-            )
-            for cache_file in cache_files:
-                cache_file.unlink()
-                current_size_mb = self.get_cache_size_mb()
-                if current_size_mb <= self._max_cache_size_mb * 0.8:  # 80% threshold
+        """Enforce disk cache size limits by removing oldest entries.
+
+        The memory cache is bounded on insert by ``_set_cached``.
+        """
+        with self._lock:
+            # Enforce disk cache limit
+            max_bytes = self._max_cache_size_mb * 1024 * 1024
+            if self._disk_usage_bytes() <= max_bytes:
+                return
+
+            # A long write-ahead log may be all that is over the limit
+            db = self._get_db()
+            db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            usage = self._disk_usage_bytes()
+            if usage <= max_bytes or self._disk_bytes == 0:
+                return
+
+            # Evicting vector bytes frees file bytes in proportion to the
+            # current overhead, so scale the 80% target down to match
+            target = max_bytes * 0.8 * self._disk_bytes / usage
+
+            # Remove oldest entries first; rowids grow with each insert
+            stale_keys = []
+            for key, size in db.execute(
+                "SELECT key, LENGTH(vec) FROM embeddings ORDER BY rowid"
+            ).fetchall():
+                stale_keys.append((key,))
+                self._disk_bytes -= size
+                if self._disk_bytes <= target:
                     break
+            db.executemany("DELETE FROM embeddings WHERE key = ?", stale_keys)
+            # Release the freed pages (a no-op for databases created before
+            # incremental auto-vacuum was enabled) and the log that recorded it
+            db.execute("PRAGMA incremental_vacuum")
+            db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
 
     def is_using_transformer(self) -> bool:
         """Check if using transformer model or fallback.
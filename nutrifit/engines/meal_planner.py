@@ -3,10 +3,12 @@
 import random
 import uuid
 from datetime import date, timedelta
-from typing import Any
+from typing import Any, Iterable
+
+import numpy as np
 
 from nutrifit.data.recipes import get_sample_recipes
-from nutrifit.engines.embedding_engine import EmbeddingEngine
+from nutrifit.engines.embedding_engine import EmbeddingEngine, top_k_indices
 from nutrifit.engines.llm_engine import LocalLLMEngine
 from nutrifit.models.plan import DailyMealPlan, MealPlan
 from nutrifit.models.recipe import Recipe
@@ -21,6 +23,15 @@ class MealPlannerEngine:
     user preferences, available ingredients, and nutritional goals.
     """
 
+    # Recipe tags that satisfy each dietary preference; vegetarian accepts
+    # vegan recipes and pescatarian accepts both. Preferences not listed here
+    # (keto, paleo, gluten_free, ...) require an exact tag match.
+    DIET_ACCEPTED_TAGS: dict[str, frozenset[str]] = {
+        "vegetarian": frozenset({"vegetarian", "vegan"}),
+        "vegan": frozenset({"vegan"}),
+        "pescatarian": frozenset({"pescatarian", "vegetarian", "vegan"}),
+    }
+
     def __init__(
         self,
         embedding_engine: EmbeddingEngine | None = None,
@@ -38,6 +49,8 @@ class MealPlannerEngine:
         self.llm_engine = llm_engine or LocalLLMEngine()
         self.recipes = recipes or get_sample_recipes()
         self._recipe_embeddings: dict[str, Any] = {}
+        self._recipe_matrix: np.ndarray = np.empty((0, 0), dtype=np.float32)
+        self._recipe_rows: dict[str, int] = {}
         self._initialize_recipe_embeddings()
 
     def _initialize_recipe_embeddings(self) -> None:
@@ -50,6 +63,14 @@ class MealPlannerEngine:
         for recipe_id, embedding in zip(ids, embeddings, strict=False):
             self._recipe_embeddings[recipe_id] = embedding
 
+        # Unit-length rows so a single matrix product yields cosine scores
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim == 2:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self._recipe_matrix = matrix / norms
+        self._recipe_rows = {recipe_id: row for row, recipe_id in enumerate(ids)}
+
     def _get_dietary_filters(self, user: UserProfile) -> list[str]:
         """Convert user dietary preferences to filter strings."""
         filters = []
@@ -70,39 +91,16 @@ class MealPlannerEngine:
         if not dietary_filters:
             return recipes
 
+        accepted = [
+            self.DIET_ACCEPTED_TAGS.get(diet_filter, frozenset((diet_filter,)))
+            for diet_filter in dietary_filters
+        ]
+
         filtered = []
         for recipe in recipes:
-            # Check if recipe matches ALL dietary preferences
-            matches = True
-            for diet_filter in dietary_filters:
-                if diet_filter == "vegetarian":
-                    # Vegetarian accepts both vegetarian and vegan recipes
-                    if not any(
-                        d in ["vegetarian", "vegan"] for d in recipe.dietary_info
-                    ):
-                        matches = False
-                        break
-                elif diet_filter == "vegan":
-                    # Vegan requires strict vegan marking
-                    if "vegan" not in recipe.dietary_info:
-                        matches = False
-                        break
-                elif diet_filter == "pescatarian":
-                    # Pescatarian accepts pescatarian, vegetarian, and vegan
-                    if not any(
-                        d in ["pescatarian", "vegetarian", "vegan"] 
-                        for d in recipe.dietary_info
-                    ):
-                        matches = False
-                        break
-                else:
-                    # For other preferences (keto, paleo, gluten_free, dairy_free, etc.)
-                    # require exact match in dietary_info
-                    if diet_filter not in recipe.dietary_info:
-                        matches = False
-                        break
-            
-            if matches:
+            # Build the tag set once per recipe; it must satisfy ALL preferences
+            info = set(recipe.dietary_info)
+            if all(not tags.isdisjoint(info) for tags in accepted):
                 filtered.append(recipe)
 
         return filtered
@@ -136,8 +134,17 @@ class MealPlannerEngine:
         """Filter recipes by meal type."""
         return [r for r in recipes if r.meal_type == meal_type]
 
+    @staticmethod
+    def _normalize_pantry(pantry_items: Iterable[str]) -> tuple[str, ...]:
+        """Lowercase, strip and de-duplicate pantry items for matching.
+
+        Callers scoring many recipes against one pantry normalize it once and
+        pass the result to _score_against_pantry.
+        """
+        return tuple(dict.fromkeys(p.lower().strip() for p in pantry_items))
+
     def _score_recipe_for_pantry(
-        self, recipe: Recipe, pantry_items: list[str]
+        self, recipe: Recipe, pantry_items: Iterable[str]
     ) -> float:
         """Score a recipe based on how many pantry items it uses.
         
@@ -148,14 +155,18 @@ class MealPlannerEngine:
         
         This ensures recipes with more pantry ingredients score higher.
         """
-        if not pantry_items:
+        return self._score_against_pantry(recipe, self._normalize_pantry(pantry_items))
+
+    def _score_against_pantry(
+        self, recipe: Recipe, pantry_lower: tuple[str, ...]
+    ) -> float:
+        """Score a recipe against a pantry already passed through _normalize_pantry."""
+        if not pantry_lower:
             return 0.5
 
         recipe_ingredients = recipe.get_ingredient_names()
         if not recipe_ingredients:
             return 0.0
-        
-        pantry_lower = [p.lower().strip() for p in pantry_items]
 
         matches = 0
         for ingredient in recipe_ingredients:
@@ -168,6 +179,105 @@ class MealPlannerEngine:
 
         return matches / len(recipe_ingredients)
 
+    def _get_candidate_recipes(
+        self, user: UserProfile, meal_type: str
+    ) -> list[Recipe]:
+        """Get recipes for a meal type that respect the user's diet and allergies."""
+        dietary_filters = self._get_dietary_filters(user)
+        candidates = self._filter_recipes_by_diet(self.recipes, dietary_filters)
+        candidates = self._filter_recipes_by_allergies(candidates, user.allergies)
+        candidates = self._get_recipes_by_meal_type(candidates, meal_type)
+
+        if not candidates:
+            # Fall back to just meal type filtering
+            candidates = self._get_recipes_by_meal_type(self.recipes, meal_type)
+
+        return candidates
+
+    def _get_query_scores(self, queries: list[str | None]) -> np.ndarray | None:
+        """Compute cosine scores of each query against every recipe.
+
+        Args:
+            queries: One optional query per row
+
+        Returns:
+            Array of shape (len(queries), len(recipes)), or None if no
+            query was given. Rows without a query are left as NaN.
+        """
+        present = [i for i, query in enumerate(queries) if query]
+        if not present or self._recipe_matrix.size == 0:
+            return None
+
+        query_matrix = np.asarray(
+            self.embedding_engine.embed_batch([queries[i] for i in present]),
+            dtype=np.float32,
+        )
+        norms = np.linalg.norm(query_matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+
+        scores = np.full((len(queries), len(self.recipes)), np.nan)
+        scores[present] = (query_matrix / norms) @ self._recipe_matrix.T
+        return scores
+
+    def find_matching_recipes_batch(
+        self,
+        users: list[UserProfile],
+        meal_type: str,
+        queries: list[str | None] | None = None,
+        top_k: int = 5,
+    ) -> list[list[tuple[Recipe, float]]]:
+        """Find matching recipes for several users in one pass.
+
+        All query embeddings are scored against the recipe matrix with a
+        single matrix product instead of one similarity search per recipe.
+
+        Args:
+            users: User profiles with preferences
+            meal_type: Type of meal to find recipes for
+            queries: Optional search query per user
+            top_k: Number of top results to return per user
+
+        Returns:
+            One list of (Recipe, score) tuples per user
+        """
+        if queries is not None and len(queries) != len(users):
+            raise ValueError("queries must have one entry per user")
+
+        query_scores = self._get_query_scores(queries or [None] * len(users))
+
+        results = []
+        for i, user in enumerate(users):
+            candidates = self._get_candidate_recipes(user, meal_type)
+            if not candidates:
+                results.append([])
+                continue
+
+            # Base score from pantry matching, normalizing the pantry once per user
+            pantry_lower = self._normalize_pantry(user.pantry_items)
+            pantry_scores = np.array(
+                [
+                    self._score_against_pantry(recipe, pantry_lower)
+                    for recipe in candidates
+                ]
+            )
+
+            # Semantic similarity score if a query was provided
+            semantic_scores = np.full(len(candidates), 0.5)
+            if query_scores is not None and not np.isnan(query_scores[i, 0]):
+                rows = [self._recipe_rows[recipe.id] for recipe in candidates]
+                semantic_scores = query_scores[i, rows]
+
+            # Combined score
+            combined = 0.4 * pantry_scores + 0.6 * semantic_scores
+            results.append(
+                [
+                    (candidates[j], float(combined[j]))
+                    for j in top_k_indices(combined, top_k)
+                ]
+            )
+
+        return results
+
     def find_matching_recipes(
         self,
         user: UserProfile,
@@ -186,42 +296,7 @@ class MealPlannerEngine:
         Returns:
             List of (Recipe, score) tuples
         """
-        # Apply filters
-        dietary_filters = self._get_dietary_filters(user)
-        candidates = self._filter_recipes_by_diet(self.recipes, dietary_filters)
-        candidates = self._filter_recipes_by_allergies(candidates, user.allergies)
-        candidates = self._get_recipes_by_meal_type(candidates, meal_type)
-
-        if not candidates:
-            # Fall back to just meal type filtering
-            candidates = self._get_recipes_by_meal_type(self.recipes, meal_type)
-
-        if not candidates:
-            return []
-
-        # Score recipes
-        scored_recipes = []
-        for recipe in candidates:
-            # Base score from pantry matching
-            pantry_score = self._score_recipe_for_pantry(recipe, user.pantry_items)
-
-            # Semantic similarity score if query provided
-            if query:
-                recipe_text = recipe.get_searchable_text()
-                similar = self.embedding_engine.find_similar(
-                    query, [recipe_text], [recipe.id], top_k=1
-                )
-                semantic_score = similar[0][2] if similar else 0.5
-            else:
-                semantic_score = 0.5
-
-            # Combined score
-            combined_score = 0.4 * pantry_score + 0.6 * semantic_score
-            scored_recipes.append((recipe, combined_score))
-
-        # Sort by score and return top_k
-        scored_recipes.sort(key=lambda x: x[1], reverse=True)
-        return scored_recipes[:top_k]
+        return self.find_matching_recipes_batch([user], meal_type, [query], top_k)[0]
 
     def _select_recipe_for_meal(
         self,
@@ -230,6 +305,7 @@ class MealPlannerEngine:
         target_calories: int,
         used_recipe_ids: set[str],
         calorie_tolerance: float = 0.3,
+        matches: list[tuple[Recipe, float]] | None = None,
     ) -> Recipe | None:
         """Select a single recipe for a meal.
 
@@ -239,11 +315,13 @@ class MealPlannerEngine:
             target_calories: Target calories for this meal
             used_recipe_ids: Set of already used recipe IDs
             calorie_tolerance: Tolerance for calorie matching (default 30%)
+            matches: Precomputed matches for this meal type, if available
 
         Returns:
             Selected recipe or None
         """
-        matches = self.find_matching_recipes(user, meal_type, top_k=10)
+        if matches is None:
+            matches = self.find_matching_recipes(user, meal_type, top_k=10)
 
         # Filter out already used recipes
         available = [(r, s) for r, s in matches if r.id not in used_recipe_ids]
@@ -291,6 +369,16 @@ class MealPlannerEngine:
         Returns:
             Daily meal plan
         """
+        return self._build_daily_plan(user, plan_date, include_snacks, {})
+
+    def _build_daily_plan(
+        self,
+        user: UserProfile,
+        plan_date: date,
+        include_snacks: bool,
+        matches_by_meal: dict[str, list[tuple[Recipe, float]]],
+    ) -> DailyMealPlan:
+        """Build a daily plan, reusing any precomputed matches per meal type."""
         daily_calories = user.daily_calorie_target or 2000
         used_recipe_ids: set[str] = set()
 
@@ -301,19 +389,22 @@ class MealPlannerEngine:
 
         # Select recipes
         breakfast = self._select_recipe_for_meal(
-            user, "breakfast", breakfast_cal, used_recipe_ids
+            user, "breakfast", breakfast_cal, used_recipe_ids,
+            matches=matches_by_meal.get("breakfast"),
         )
         if breakfast:
             used_recipe_ids.add(breakfast.id)
 
         lunch = self._select_recipe_for_meal(
-            user, "lunch", lunch_cal, used_recipe_ids
+            user, "lunch", lunch_cal, used_recipe_ids,
+            matches=matches_by_meal.get("lunch"),
         )
         if lunch:
             used_recipe_ids.add(lunch.id)
 
         dinner = self._select_recipe_for_meal(
-            user, "dinner", dinner_cal, used_recipe_ids
+            user, "dinner", dinner_cal, used_recipe_ids,
+            matches=matches_by_meal.get("dinner"),
         )
         if dinner:
             used_recipe_ids.add(dinner.id)
@@ -321,7 +412,8 @@ class MealPlannerEngine:
         snacks = []
         if include_snacks:
             snack = self._select_recipe_for_meal(
-                user, "snack", int(daily_calories * 0.1), used_recipe_ids
+                user, "snack", int(daily_calories * 0.1), used_recipe_ids,
+                matches=matches_by_meal.get("snack"),
             )
             if snack:
                 snacks.append(snack)
@@ -353,10 +445,17 @@ class MealPlannerEngine:
         start_date = start_date or date.today()
         end_date = start_date + timedelta(days=6)
 
+        # Matches depend only on the user and meal type, so rank each meal
+        # type once for the whole week rather than once per day
+        matches_by_meal = {
+            meal_type: self.find_matching_recipes_batch([user], meal_type, top_k=10)[0]
+            for meal_type in ("breakfast", "lunch", "dinner", "snack")
+        }
+
         daily_plans = []
         for day_offset in range(7):
             plan_date = start_date + timedelta(days=day_offset)
-            daily_plan = self.generate_daily_plan(user, plan_date)
+            daily_plan = self._build_daily_plan(user, plan_date, True, matches_by_meal)
             daily_plans.append(daily_plan)
 
         return MealPlan(
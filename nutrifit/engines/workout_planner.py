@@ -5,8 +5,10 @@ import uuid
 from datetime import date, timedelta
 from typing import Any
 
+import numpy as np
+
 from nutrifit.data.workouts import get_sample_workouts
-from nutrifit.engines.embedding_engine import EmbeddingEngine
+from nutrifit.engines.embedding_engine import EmbeddingEngine, top_k_indices
 from nutrifit.engines.llm_engine import LocalLLMEngine
 from nutrifit.models.plan import DailyWorkoutPlan, WorkoutPlan
 from nutrifit.models.user import FitnessGoal, UserProfile
@@ -21,6 +23,9 @@ class WorkoutPlannerEngine:
     user goals, available equipment, and fitness level.
     """
 
+    # Equipment every user has, whatever their profile lists
+    ALWAYS_AVAILABLE_EQUIPMENT = frozenset({"bodyweight", "none"})
+
     def __init__(
         self,
         embedding_engine: EmbeddingEngine | None = None,
@@ -38,6 +43,8 @@ class WorkoutPlannerEngine:
         self.llm_engine = llm_engine or LocalLLMEngine()
         self.workouts = workouts or get_sample_workouts()
         self._workout_embeddings: dict[str, Any] = {}
+        self._workout_matrix: np.ndarray = np.empty((0, 0), dtype=np.float32)
+        self._workout_rows: dict[str, int] = {}
         self._initialize_workout_embeddings()
 
     def _initialize_workout_embeddings(self) -> None:
@@ -50,6 +57,14 @@ class WorkoutPlannerEngine:
         for workout_id, embedding in zip(ids, embeddings, strict=False):
             self._workout_embeddings[workout_id] = embedding
 
+        # Unit-length rows so a single matrix product yields cosine scores
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim == 2:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self._workout_matrix = matrix / norms
+        self._workout_rows = {workout_id: row for row, workout_id in enumerate(ids)}
+
     def _get_goal_workout_types(self, goals: list[FitnessGoal]) -> list[str]:
         """Map fitness goals to preferred workout types."""
         goal_to_types = {
@@ -72,21 +87,15 @@ class WorkoutPlannerEngine:
         self, workouts: list[Workout], available_equipment: list[str]
     ) -> list[Workout]:
         """Filter workouts based on available equipment."""
-        if not available_equipment:
-            # Include bodyweight workouts if no equipment specified
-            available_equipment = ["bodyweight", "none"]
-
-        # Always include bodyweight as available
-        available_lower = [e.lower() for e in available_equipment]
-        available_lower.extend(["bodyweight", "none"])
-
-        filtered = []
-        for workout in workouts:
-            needed_equipment = workout.get_all_equipment_needed()
-            if not needed_equipment:
-                filtered.append(workout)
-            elif all(eq in available_lower for eq in needed_equipment):
-                filtered.append(workout)
+        # Always include bodyweight as available, even with no equipment listed
+        available = {e.lower() for e in available_equipment}
+        available |= self.ALWAYS_AVAILABLE_EQUIPMENT
+
+        filtered = [
+            workout
+            for workout in workouts
+            if available.issuperset(workout.get_all_equipment_needed())
+        ]
 
         return filtered if filtered else workouts
 
@@ -149,26 +158,13 @@ class WorkoutPlannerEngine:
 
         return list(muscles)
 
-    def find_matching_workouts(
+    def _get_candidate_workouts(
         self,
         user: UserProfile,
-        workout_type: str | None = None,
-        query: str | None = None,
-        max_duration: int = 60,
-        top_k: int = 5,
-    ) -> list[tuple[Workout, float]]:
-        """Find workouts matching user preferences and optional query.
-
-        Args:
-            user: User profile with preferences
-            workout_type: Optional specific workout type
-            query: Optional search query
-            max_duration: Maximum workout duration in minutes
-            top_k: Number of top results to return
-
-        Returns:
-            List of (Workout, score) tuples
-        """
+        workout_type: str | None,
+        max_duration: int,
+    ) -> list[Workout]:
+        """Get workouts that suit the user's goals, equipment and level."""
         # Get preferred workout types based on goals
         if workout_type:
             preferred_types = [workout_type]
@@ -196,40 +192,120 @@ class WorkoutPlannerEngine:
                 self.workouts, user.available_equipment
             )
 
-        if not candidates:
-            return []
+        return candidates
+
+    def _get_query_scores(self, queries: list[str | None]) -> np.ndarray | None:
+        """Compute cosine scores of each query against every workout.
 
-        # Score workouts
-        scored_workouts = []
-        target_muscles = self._get_muscle_groups_for_goals(user.fitness_goals)
+        Args:
+            queries: One optional query per row
+
+        Returns:
+            Array of shape (len(queries), len(workouts)), or None if no
+            query was given. Rows without a query are left as NaN.
+        """
+        present = [i for i, query in enumerate(queries) if query]
+        if not present or self._workout_matrix.size == 0:
+            return None
+
+        query_matrix = np.asarray(
+            self.embedding_engine.embed_batch([queries[i] for i in present]),
+            dtype=np.float32,
+        )
+        norms = np.linalg.norm(query_matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+
+        scores = np.full((len(queries), len(self.workouts)), np.nan)
+        scores[present] = (query_matrix / norms) @ self._workout_matrix.T
+        return scores
+
+    def find_matching_workouts_batch(
+        self,
+        users: list[UserProfile],
+        workout_type: str | None = None,
+        queries: list[str | None] | None = None,
+        max_duration: int = 60,
+        top_k: int = 5,
+    ) -> list[list[tuple[Workout, float]]]:
+        """Find matching workouts for several users in one pass.
+
+        All query embeddings are scored against the workout matrix with a
+        single matrix product instead of one similarity search per workout.
+
+        Args:
+            users: User profiles with preferences
+            workout_type: Optional specific workout type
+            queries: Optional search query per user
+            max_duration: Maximum workout duration in minutes
+            top_k: Number of top results to return per user
+
+        Returns:
+            One list of (Workout, score) tuples per user
+        """
+        if queries is not None and len(queries) != len(users):
+            raise ValueError("queries must have one entry per user")
+
+        query_scores = self._get_query_scores(queries or [None] * len(users))
+
+        results = []
+        for i, user in enumerate(users):
+            candidates = self._get_candidate_workouts(user, workout_type, max_duration)
+            if not candidates:
+                results.append([])
+                continue
 
-        for workout in candidates:
             # Score based on muscle group match
-            workout_muscles = set(workout.target_muscle_groups)
-            target_muscles_set = set(target_muscles)
-            muscle_score = (
-                len(workout_muscles & target_muscles_set) / max(len(target_muscles_set), 1)
-                if target_muscles_set
-                else 0.5
+            target_muscles_set = set(self._get_muscle_groups_for_goals(user.fitness_goals))
+            muscle_scores = np.array(
+                [
+                    len(set(workout.target_muscle_groups) & target_muscles_set)
+                    / max(len(target_muscles_set), 1)
+                    if target_muscles_set
+                    else 0.5
+                    for workout in candidates
+                ]
             )
 
-            # Semantic similarity if query provided
-            if query:
-                workout_text = workout.get_searchable_text()
-                similar = self.embedding_engine.find_similar(
-                    query, [workout_text], [workout.id], top_k=1
-                )
-                semantic_score = similar[0][2] if similar else 0.5
-            else:
-                semantic_score = 0.5
+            # Semantic similarity if a query was provided
+            semantic_scores = np.full(len(candidates), 0.5)
+            if query_scores is not None and not np.isnan(query_scores[i, 0]):
+                rows = [self._workout_rows[workout.id] for workout in candidates]
+                semantic_scores = query_scores[i, rows]
 
             # Combined score
-            combined_score = 0.4 * muscle_score + 0.6 * semantic_score
-            scored_workouts.append((workout, combined_score))
+            combined = 0.4 * muscle_scores + 0.6 * semantic_scores
+            results.append(
+                [
+                    (candidates[j], float(combined[j]))
+                    for j in top_k_indices(combined, top_k)
+                ]
+            )
 
-        # Sort by score and return top_k
-        scored_workouts.sort(key=lambda x: x[1], reverse=True)
-        return scored_workouts[:top_k]
+        return results
+
+    def find_matching_workouts(
+        self,
+        user: UserProfile,
+        workout_type: str | None = None,
+        query: str | None = None,
+        max_duration: int = 60,
+        top_k: int = 5,
+    ) -> list[tuple[Workout, float]]:
+        """Find workouts matching user preferences and optional query.
+
+        Args:
+            user: User profile with preferences
+            workout_type: Optional specific workout type
+            query: Optional search query
+            max_duration: Maximum workout duration in minutes
+            top_k: Number of top results to return
+
+        Returns:
+            List of (Workout, score) tuples
+        """
+        return self.find_matching_workouts_batch(
+            [user], workout_type, [query], max_duration, top_k
+        )[0]
 
     def _select_workout_for_day(
         self,
@@ -237,6 +313,7 @@ class WorkoutPlannerEngine:
         day_number: int,
         used_workout_ids: set[str],
         max_duration: int = 60,
+        matches_cache: dict[tuple[str, int], list[tuple[Workout, float]]] | None = None,
     ) -> Workout | None:
         """Select a workout for a specific day.
 
@@ -245,6 +322,8 @@ class WorkoutPlannerEngine:
             day_number: Day of the week (0-6)
             used_workout_ids: Set of already used workout IDs
             max_duration: Maximum workout duration
+            matches_cache: Optional cache of matches keyed by
+                (workout type, max duration), shared across days
 
         Returns:
             Selected workout or None
@@ -264,13 +343,17 @@ class WorkoutPlannerEngine:
 
         if workout_type is None:
             # Rest day or flexibility
-            matches = self.find_matching_workouts(
-                user, workout_type="flexibility", max_duration=30, top_k=5
-            )
+            workout_type, max_duration = "flexibility", 30
+
+        key = (workout_type, max_duration)
+        if matches_cache is not None and key in matches_cache:
+            matches = matches_cache[key]
         else:
             matches = self.find_matching_workouts(
                 user, workout_type=workout_type, max_duration=max_duration, top_k=5
             )
+            if matches_cache is not None:
+                matches_cache[key] = matches
 
         # Filter out already used workouts
         available = [(w, s) for w, s in matches if w.id not in used_workout_ids]
@@ -354,6 +437,8 @@ class WorkoutPlannerEngine:
 
         daily_plans = []
         used_workout_ids: set[str] = set()
+        # Strength days share the same ranking, so compute it only once
+        matches_cache: dict[tuple[str, int], list[tuple[Workout, float]]] = {}
 
         for day_offset in range(7):
             plan_date = start_date + timedelta(days=day_offset)
@@ -368,7 +453,7 @@ class WorkoutPlannerEngine:
                 )
             else:
                 workout = self._select_workout_for_day(
-                    user, day_number, used_workout_ids
+                    user, day_number, used_workout_ids, matches_cache=matches_cache
                 )
                 if workout:
                     used_workout_ids.add(workout.id)
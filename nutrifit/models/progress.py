@@ -1,10 +1,11 @@
 """Progress tracking models."""
 
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 
 
-@dataclass
+@dataclass(slots=True)
 class ProgressEntry:
     """Single progress entry for tracking."""
 
@@ -108,18 +109,51 @@ class ProgressTracker:
     entries: list[ProgressEntry] = field(default_factory=list)
     goals: dict = field(default_factory=dict)
 
+    # Date -> first entry on that date, along with the list and length it was
+    # built from so reassigning or editing `entries` directly triggers a rebuild
+    _by_date: dict[date, ProgressEntry] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _indexed_entries: list[ProgressEntry] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _indexed_count: int = field(default=0, init=False, repr=False, compare=False)
+
+    def _date_index(self) -> dict[date, ProgressEntry]:
+        """Return the date index, rebuilding it if entries changed outside add_entry."""
+        if self._indexed_entries is not self.entries or self._indexed_count != len(self.entries):
+            self._by_date = {}
+            for entry in self.entries:
+                self._by_date.setdefault(entry.date, entry)
+            self._indexed_entries = self.entries
+            self._indexed_count = len(self.entries)
+        return self._by_date
+
     def add_entry(self, entry: ProgressEntry) -> None:
         """Add a new progress entry."""
+        index = self._date_index()
         self.entries.append(entry)
         # Sort entries by date
         self.entries.sort(key=lambda e: e.date)
+        # The sort is stable, so an existing entry on the same date stays first
+        index.setdefault(entry.date, entry)
+        self._indexed_count = len(self.entries)
+
+    def add_entries(self, entries: Iterable[ProgressEntry]) -> None:
+        """Add several progress entries, sorting once for the whole batch."""
+        new_entries = list(entries)
+        if not new_entries:
+            return
+        index = self._date_index()
+        self.entries.extend(new_entries)
+        self.entries.sort(key=lambda e: e.date)
+        for entry in new_entries:
+            index.setdefault(entry.date, entry)
+        self._indexed_count = len(self.entries)
 
     def get_entry_for_date(self, target_date: date) -> ProgressEntry | None:
         """Get entry for a specific date."""
-        for entry in self.entries:
-            if entry.date == target_date:
-                return entry
-        return None
+        return self._date_index().get(target_date)
 
     def get_entries_in_range(
         self, start_date: date, end_date: date
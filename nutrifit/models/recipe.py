@@ -3,9 +3,13 @@
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NutritionInfo:
-    """Nutritional information for a recipe."""
+    """Nutritional information for a recipe.
+
+    Immutable and slotted: recipes share these values and every plan total
+    reads them, so attribute access stays on the fast path.
+    """
 
     calories: int
     protein_g: float
@@ -33,7 +37,7 @@ class NutritionInfo:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class Ingredient:
     """Recipe ingredient with quantity and unit."""
 
@@ -57,7 +61,7 @@ class Ingredient:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class Recipe:
     """Recipe with ingredients and instructions."""
 
@@ -2,6 +2,7 @@
 
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 
 
 class DietaryPreference(Enum):
@@ -31,7 +32,64 @@ class FitnessGoal(Enum):
     GENERAL_FITNESS = "general_fitness"
 
 
-@dataclass
+@lru_cache(maxsize=256)
+def _macro_ratios_impl(
+    fitness_goals: frozenset[FitnessGoal],
+    dietary_preferences: frozenset[DietaryPreference],
+) -> tuple[float, float, float]:
+    """Resolve (protein, carbs, fat) ratios for a set of goals and preferences.
+
+    The rules only test membership, so the result depends on the two sets
+    alone and is shared by every profile with the same goals and preferences.
+    """
+    # Default balanced ratios (maintenance)
+    protein_ratio = 0.30  # 30% protein
+    carbs_ratio = 0.40    # 40% carbs
+    fat_ratio = 0.30      # 30% fat
+    
+    # Adjust based on primary fitness goal
+    if FitnessGoal.WEIGHT_LOSS in fitness_goals:
+        # Higher protein, lower carbs for weight loss
+        protein_ratio = 0.35
+        carbs_ratio = 0.30
+        fat_ratio = 0.35
+    elif FitnessGoal.MUSCLE_GAIN in fitness_goals:
+        # Higher protein and carbs for muscle gain
+        protein_ratio = 0.35
+        carbs_ratio = 0.45
+        fat_ratio = 0.20
+    elif FitnessGoal.ENDURANCE in fitness_goals:
+        # Higher carbs for endurance
+        protein_ratio = 0.25
+        carbs_ratio = 0.50
+        fat_ratio = 0.25
+    elif FitnessGoal.STRENGTH in fitness_goals:
+        # Higher protein for strength
+        protein_ratio = 0.40
+        carbs_ratio = 0.35
+        fat_ratio = 0.25
+    
+    # Adjust for dietary preferences
+    if DietaryPreference.KETO in dietary_preferences:
+        # Very low carb, high fat for keto
+        protein_ratio = 0.25
+        carbs_ratio = 0.05
+        fat_ratio = 0.70
+    elif DietaryPreference.LOW_CARB in dietary_preferences:
+        # Low carb, moderate fat
+        protein_ratio = 0.35
+        carbs_ratio = 0.20
+        fat_ratio = 0.45
+    elif DietaryPreference.HIGH_PROTEIN in dietary_preferences:
+        # High protein
+        protein_ratio = 0.40
+        carbs_ratio = 0.35
+        fat_ratio = 0.25
+
+    return protein_ratio, carbs_ratio, fat_ratio
+
+
+@dataclass(slots=True)
 class UserProfile:
     """User profile containing preferences and goals."""
 
@@ -47,6 +105,8 @@ class UserProfile:
     available_equipment: list[str] = field(default_factory=list)
     daily_calorie_target: int | None = None
     meals_per_day: int = 3
+    # Macro targets the chatbot sets for this session; never persisted
+    _custom_macros: dict = field(default_factory=dict, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """Calculate default calorie target if not provided and validate data."""
@@ -105,50 +165,9 @@ class UserProfile:
         Returns:
             dict: Dictionary with keys 'protein', 'carbs', 'fat' as percentages (0-1)
         """
-        # Default balanced ratios (maintenance)
-        protein_ratio = 0.30  # 30% protein
-        carbs_ratio = 0.40    # 40% carbs
-        fat_ratio = 0.30      # 30% fat
-        
-        # Adjust based on primary fitness goal
-        if FitnessGoal.WEIGHT_LOSS in self.fitness_goals:
-            # Higher protein, lower carbs for weight loss
-            protein_ratio = 0.35
-            carbs_ratio = 0.30
-            fat_ratio = 0.35
-        elif FitnessGoal.MUSCLE_GAIN in self.fitness_goals:
-            # Higher protein and carbs for muscle gain
-            protein_ratio = 0.35
-            carbs_ratio = 0.45
-            fat_ratio = 0.20
-        elif FitnessGoal.ENDURANCE in self.fitness_goals:
-            # Higher carbs for endurance
-            protein_ratio = 0.25
-            carbs_ratio = 0.50
-            fat_ratio = 0.25
-        elif FitnessGoal.STRENGTH in self.fitness_goals:
-            # Higher protein for strength
-            protein_ratio = 0.40
-            carbs_ratio = 0.35
-            fat_ratio = 0.25
-        
-        # Adjust for dietary preferences
-        if DietaryPreference.KETO in self.dietary_preferences:
-            # Very low carb, high fat for keto
-            protein_ratio = 0.25
-            carbs_ratio = 0.05
-            fat_ratio = 0.70
-        elif DietaryPreference.LOW_CARB in self.dietary_preferences:
-            # Low carb, moderate fat
-            protein_ratio = 0.35
-            carbs_ratio = 0.20
-            fat_ratio = 0.45
-        elif DietaryPreference.HIGH_PROTEIN in self.dietary_preferences:
-            # High protein
-            protein_ratio = 0.40
-            carbs_ratio = 0.35
-            fat_ratio = 0.25
-        
+        protein_ratio, carbs_ratio, fat_ratio = _macro_ratios_impl(
+            frozenset(self.fitness_goals), frozenset(self.dietary_preferences)
+        )
         return {
             "protein": protein_ratio,
             "carbs": carbs_ratio,
@@ -47,6 +47,8 @@ class PlanParser:
     )
     CALORIES_ONLY_PATTERN = re.compile(r'~?(\d+)\s*kcal', re.IGNORECASE)
     DAY_PATTERN = re.compile(r'\*\*Day\s+(\d+)', re.IGNORECASE)
+    # Workout day headers like "**Day 1 - Upper Body:**"
+    WORKOUT_DAY_HEADER_PATTERN = re.compile(r'\*\*Day\s+\d+\s*[-–]\s*([^:*]+)', re.IGNORECASE)
     
     # Regex patterns for exercise extraction
     EXERCISE_LINE_PATTERN = re.compile(r'-\s*([^:]+):\s*([^\n]+)')
@@ -290,11 +292,8 @@ class PlanParser:
         current_day_name = None
         current_text = []
         
-        # Pattern for workout day headers like "**Day 1 - Upper Body:**"
-        day_header_pattern = re.compile(r'\*\*Day\s+\d+\s*[-–]\s*([^:*]+)', re.IGNORECASE)
-        
         for line in lines:
-            day_match = day_header_pattern.search(line)
+            day_match = self.WORKOUT_DAY_HEADER_PATTERN.search(line)
             if day_match:
                 # Save previous day
                 if current_day_name is not None:
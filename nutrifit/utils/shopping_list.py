@@ -2,6 +2,7 @@
 
 from collections import defaultdict
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 from nutrifit.models.plan import MealPlan
 from nutrifit.models.recipe import Recipe
@@ -57,16 +58,24 @@ class ShoppingList:
         return [item for item in self.items if not item.is_optional]
 
     def remove_pantry_items(self) -> "ShoppingList":
-        """Create a new list without items already in pantry."""
-        pantry_lower = [p.lower() for p in self.pantry_items_available]
+        """Create a new list without items already in pantry.
+
+        An item counts as in the pantry when its name and a pantry entry
+        contain one another, ignoring case.
+        """
+        # Lowercase and de-duplicate the pantry once; exact name matches are
+        # the common case, so check them with a set lookup before scanning
+        # entries for substring matches
+        pantry_lower = list(dict.fromkeys(p.lower() for p in self.pantry_items_available))
+        pantry_set = frozenset(pantry_lower)
         filtered_items = []
 
         for item in self.items:
-            in_pantry = False
-            for pantry_item in pantry_lower:
-                if pantry_item in item.name.lower() or item.name.lower() in pantry_item:
-                    in_pantry = True
-                    break
+            name_lower = item.name.lower()
+            in_pantry = name_lower in pantry_set or any(
+                pantry_item in name_lower or name_lower in pantry_item
+                for pantry_item in pantry_lower
+            )
             if not in_pantry:
                 filtered_items.append(item)
 
@@ -228,12 +237,16 @@ class ShoppingListOptimizer:
 
     def __init__(self) -> None:
         """Initialize the shopping list optimizer."""
-        pass
+        # Weekly plans repeat the same ingredient names, so memoize the
+        # keyword scan per lowercased name for this optimizer's CATEGORY_MAP
+        self._category_for = lru_cache(maxsize=4096)(self._match_category)
 
     def _categorize_ingredient(self, ingredient_name: str) -> str:
         """Determine the category of an ingredient."""
-        name_lower = ingredient_name.lower()
+        return self._category_for(ingredient_name.lower())
 
+    def _match_category(self, name_lower: str) -> str:
+        """Return the category of the first CATEGORY_MAP keyword in a lowercased name."""
         for key, category in self.CATEGORY_MAP.items():
             if key in name_lower:
                 return category
@@ -259,20 +272,27 @@ class ShoppingListOptimizer:
 
         return unit1 == unit2
 
-    def _combine_items(
-        self, item1: ShoppingItem, item2: ShoppingItem
-    ) -> ShoppingItem:
-        """Combine two compatible shopping items."""
-        combined_recipes = list(set(item1.recipes_used_in + item2.recipes_used_in))
+    def _combine_items(self, items: list[ShoppingItem]) -> ShoppingItem:
+        """Combine compatible shopping items into one, in a single pass.
+
+        Name, unit and category come from the first item; recipes are
+        de-duplicated in first-seen order.
+        """
+        first = items[0]
+        recipes_used_in: dict[str, None] = {}
+        quantity = 0.0
+        for item in items:
+            quantity += item.quantity
+            recipes_used_in.update(dict.fromkeys(item.recipes_used_in))
 
         return ShoppingItem(
-            name=item1.name,
-            quantity=item1.quantity + item2.quantity,
-            unit=item1.unit,
-            category=item1.category,
-            recipes_used_in=combined_recipes,
-            is_optional=item1.is_optional and item2.is_optional,
-            notes=item1.notes or item2.notes,
+            name=first.name,
+            quantity=quantity,
+            unit=first.unit,
+            category=first.category,
+            recipes_used_in=list(recipes_used_in),
+            is_optional=all(item.is_optional for item in items),
+            notes=next((item.notes for item in items if item.notes), ""),
         )
 
     def generate_from_recipes(
@@ -379,19 +399,16 @@ class ShoppingListOptimizer:
     ) -> list[ShoppingItem]:
         """Consolidate duplicate items in the list."""
         # Group by normalized name and unit
-        groups: dict[str, list[ShoppingItem]] = defaultdict(list)
+        groups: dict[tuple[str, str], list[ShoppingItem]] = defaultdict(list)
 
         for item in items:
-            key = f"{item.name.lower()}|{self._normalize_unit(item.unit)}"
-            groups[key].append(item)
-
-        # Combine items in each group
-        consolidated = []
-        for group_items in groups.values():
-            combined = group_items[0]
-            for item in group_items[1:]:
-                combined = self._combine_items(combined, item)
-            consolidated.append(combined)
+            groups[(item.name.lower(), self._normalize_unit(item.unit))].append(item)
+
+        # Combine each group once; single items pass through unchanged
+        consolidated = [
+            group_items[0] if len(group_items) == 1 else self._combine_items(group_items)
+            for group_items in groups.values()
+        ]
 
         # Sort by category then name
         consolidated.sort(key=lambda x: (x.category, x.name.lower()))
@@ -2,6 +2,7 @@
 
 import json
 import logging
+import os
 import shutil
 from datetime import date, datetime
 from pathlib import Path
@@ -11,12 +12,43 @@ from nutrifit.models.plan import MealPlan, WorkoutPlan
 from nutrifit.models.progress import ProgressEntry, ProgressTracker
 from nutrifit.models.user import UserProfile
 
+# Optional faster JSON encoder/decoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 T = TypeVar("T")
 
+# Flags for writing temp files; O_BINARY stops Windows translating newlines
+_TEMP_FILE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
+def _dumps(data: Any) -> bytes:
+    """Encode data as indented UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(data, indent=2, default=str).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    """Decode UTF-8 JSON bytes, with orjson when it is installed.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+    catch the stdlib error either way.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
 class StorageError(Exception):
     """Base exception for storage-related errors."""
     pass
@@ -136,6 +168,29 @@ class StorageManager:
             return [self._serialize(item) for item in obj]
         return obj
 
+    @staticmethod
+    def _write_synced(path: Path, payload: bytes) -> None:
+        """Write bytes straight to a file descriptor and flush them to disk.
+
+        Syncing before the caller renames the file means a crash cannot
+        leave an empty or truncated file in place of the previous data.
+
+        Args:
+            path: Path to write
+            payload: Encoded file contents
+
+        Raises:
+            OSError: If the file cannot be opened, written or synced
+        """
+        fd = os.open(path, _TEMP_FILE_FLAGS, 0o666)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
     def _save_json(self, path: Path, data: dict) -> None:
         """Save data to JSON file with error handling.
         
@@ -151,15 +206,14 @@ class StorageManager:
             serialized = self._serialize(data)
             # Write to temporary file first
             temp_path = path.with_suffix('.tmp')
-            with open(temp_path, "w", encoding="utf-8") as f:
-                json.dump(serialized, f, indent=2, default=str)
+            self._write_synced(temp_path, _dumps(serialized))
             
             # Verify the file is valid JSON
-            with open(temp_path, encoding="utf-8") as f:
-                json.load(f)
+            with open(temp_path, "rb") as f:
+                _loads(f.read())
             
             # Move temp file to final location
-            temp_path.replace(path)
+            os.replace(temp_path, path)
             logger.info(f"Successfully saved data to {path}")
         except OSError as e:
             error_msg = f"Failed to write file {path}: {e}"
@@ -170,6 +224,39 @@ class StorageManager:
             logger.error(error_msg)
             raise ValidationError(error_msg) from e
 
+    @staticmethod
+    def _json_entries(directory: Path) -> list[os.DirEntry]:
+        """List the .json files in a directory in a single scandir pass.
+
+        DirEntry takes the file type from the directory listing and caches its
+        stat result, so callers need no separate exists()/stat() calls.
+
+        Args:
+            directory: Directory to scan
+
+        Returns:
+            Entries for the regular .json files, or an empty list if the
+            directory is missing or unreadable
+        """
+        try:
+            with os.scandir(directory) as entries:
+                return [
+                    entry for entry in entries
+                    if entry.name.endswith(".json") and entry.is_file()
+                ]
+        except OSError as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Failed to scan {directory}: {e}")
+            return []
+
+    @staticmethod
+    def _entry_mtime(entry: os.DirEntry) -> float | None:
+        """Return a scanned file's modification time, or None if it is gone."""
+        try:
+            return entry.stat().st_mtime
+        except OSError:
+            return None
+
     def _load_json(self, path: Path) -> dict | None:
         """Load data from JSON file with error handling.
         
@@ -188,11 +275,11 @@ class StorageManager:
             return None
         
         try:
-            with open(path, encoding="utf-8") as f:
-                data = json.load(f)
+            with open(path, "rb") as f:
+                data = _loads(f.read())
             logger.info(f"Successfully loaded data from {path}")
             return data
-        except json.JSONDecodeError as e:
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
             error_msg = f"Corrupted JSON file {path}: {e}"
             logger.error(error_msg)
             raise CorruptedDataError(error_msg) from e
@@ -244,11 +331,7 @@ class StorageManager:
     def list_user_profiles(self) -> list[str]:
         """List all saved user profile IDs."""
         profiles_dir = self.data_dir / "users"
-        try:
-            return [p.stem for p in profiles_dir.glob("*.json")]
-        except OSError as e:
-            logger.error(f"Failed to list user profiles: {e}")
-            return []
+        return [entry.name[:-len(".json")] for entry in self._json_entries(profiles_dir)]
 
     def delete_user_profile(self, user_id: str) -> bool:
         """Delete a user profile.
@@ -289,7 +372,8 @@ class StorageManager:
         start_str = start_date.isoformat()
         end_str = end_date.isoformat()
         
-        for path in plans_dir.glob("*.json"):
+        for entry in self._json_entries(plans_dir):
+            path = Path(entry.path)
             try:
                 data = self._load_json(path)
                 if data:
@@ -364,12 +448,13 @@ class StorageManager:
         plans_dir = self.data_dir / "meal_plans"
         plans_by_range: dict[tuple[str, str], dict] = {}
         
-        for path in plans_dir.glob("*.json"):
+        for entry in self._json_entries(plans_dir):
+            path = Path(entry.path)
             try:
                 data = self._load_json(path)
                 if data:
                     # Get file modification time
-                    mtime = path.stat().st_mtime if path.exists() else None
+                    mtime = self._entry_mtime(entry)
                     start_date = data.get("start_date") or ""
                     end_date = data.get("end_date") or ""
                     
@@ -504,7 +589,8 @@ class StorageManager:
         start_str = start_date.isoformat()
         end_str = end_date.isoformat()
         
-        for path in plans_dir.glob("*.json"):
+        for entry in self._json_entries(plans_dir):
+            path = Path(entry.path)
             try:
                 data = self._load_json(path)
                 if data:
@@ -524,12 +610,13 @@ class StorageManager:
         """List all saved workout plans with basic info."""
         plans_dir = self.data_dir / "workout_plans"
         plans = []
-        for path in plans_dir.glob("*.json"):
+        for entry in self._json_entries(plans_dir):
+            path = Path(entry.path)
             try:
                 data = self._load_json(path)
                 if data:
                     # Get file modification time to distinguish plans with same date
-                    mtime = path.stat().st_mtime if path.exists() else None
+                    mtime = self._entry_mtime(entry)
                     plans.append({
                         "id": data.get("id"),
                         "name": data.get("name"),
@@ -634,6 +721,31 @@ class StorageManager:
         tracker.add_entry(entry)
         self.save_progress_tracker(tracker, user_id)
 
+    def add_progress_entries(
+        self, entries: list[ProgressEntry], user_id: str = "default"
+    ) -> None:
+        """Add several progress entries for a user with one load and one save.
+
+        Every entry is validated before anything is written, so an invalid
+        entry leaves the stored tracker unchanged.
+
+        Args:
+            entries: Progress entries to add
+            user_id: User identifier
+            
+        Raises:
+            ValidationError: If any progress entry is invalid
+            PermissionError: If unable to write file
+        """
+        for entry in entries:
+            self._validate_data(entry)
+        tracker = self.load_progress_tracker(user_id)
+        if tracker is None:
+            tracker = ProgressTracker(user_id=user_id)
+
+        tracker.add_entries(entries)
+        self.save_progress_tracker(tracker, user_id)
+
     def get_progress_summary(self, user_id: str = "default") -> dict | None:
         """Get progress summary for a user.
 
@@ -195,7 +195,7 @@ def get_context():
     """
     try:
         chatbot = get_chatbot_engine()
-        context = chatbot.export_context()
+        context = chatbot.export_context(copy=True)
         
         # Convert plans to dict for JSON serialization
         serialized_context = {}
@@ -247,7 +247,7 @@ def save_plan():
         
         # Get chatbot engine and retrieve plan from context
         chatbot = get_chatbot_engine()
-        context = chatbot.export_context()
+        context = chatbot.export_context(copy=True)
         
         # Look for the generated plan in context
         plan_key = f"generated_plan_{plan_id}"
@@ -0,0 +1,71 @@
+"""Shared pytest fixtures for the NutriFit test suite."""
+
+import logging
+
+import pytest
+from hypothesis import HealthCheck, settings
+
+from nutrifit.engines.embedding_engine import EmbeddingEngine
+from nutrifit.engines.llm_engine import LocalLLMEngine
+from nutrifit.models.user import UserProfile
+
+# Property tests are pure and regenerate their examples every run, so skip the
+# on-disk example database; model-backed properties are slow by design
+settings.register_profile(
+    "nutrifit",
+    database=None,
+    deadline=None,
+    suppress_health_check=[HealthCheck.too_slow],
+)
+settings.load_profile("nutrifit")
+
+
+@pytest.fixture(autouse=True)
+def _quiet_logs(caplog):
+    """Only let WARNING and above through the nutrifit loggers during tests.
+
+    INFO records (retry progress and the like) are then rejected before their
+    messages are formatted. Tests asserting on lower levels can lower it again
+    with caplog.set_level.
+    """
+    caplog.set_level(logging.WARNING, logger="nutrifit")
+
+
+@pytest.fixture(scope="session")
+def shared_embedding_engine(tmp_path_factory):
+    """Create one EmbeddingEngine for the whole session.
+
+    Loading the embedding model dominates construction time, so tests share
+    a single instance and reset its cache directory per test instead.
+    """
+    with EmbeddingEngine(cache_dir=tmp_path_factory.mktemp("embeddings")) as engine:
+        yield engine
+
+
+@pytest.fixture(scope="session")
+def fallback_llm_engine():
+    """Create a template-only LLM engine for the whole session.
+
+    Responses are deterministic and never touch a model or the network.
+    Pass it explicitly to planners as well: their default LocalLLMEngine()
+    tries to load GPT-2.
+    """
+    return LocalLLMEngine(use_fallback=True)
+
+
+@pytest.fixture(scope="session")
+def default_profile():
+    """Create a basic adult profile with a fixed 2000 kcal target.
+
+    Shared across the session, so tests must not mutate it; derive a variant
+    with dataclasses.replace when a test needs different fields or hands the
+    profile to code that updates it.
+    """
+    return UserProfile(
+        name="Test User",
+        age=30,
+        weight_kg=70,
+        height_cm=175,
+        gender="male",
+        daily_calorie_target=2000,
+    )
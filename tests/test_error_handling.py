@@ -1,33 +1,43 @@
 """Tests for error handling and fallback mechanisms."""
 
+import dataclasses
+from unittest.mock import Mock
+
 import pytest
 from nutrifit.engines.chatbot_engine import ChatbotEngine
 from nutrifit.parsers.plan_parser import PlanParser
-from nutrifit.models.user import UserProfile, DietaryPreference, FitnessGoal
+from nutrifit.models.user import DietaryPreference, FitnessGoal
+
+
+@pytest.fixture(scope="module")
+def chatbot_no_llm():
+    """Create a chatbot without any LLM backend or planners."""
+    return ChatbotEngine(
+        llm_engine=None,
+        meal_planner=None,
+        workout_planner=None,
+        use_ollama=False,
+        use_openai=False,
+        use_llm_generation=True
+    )
+
+
+@pytest.fixture
+def chatbot(chatbot_no_llm):
+    """Yield the shared no-LLM chatbot and clear its conversation afterwards."""
+    yield chatbot_no_llm
+    chatbot_no_llm.reset_conversation()
+    chatbot_no_llm.user_profile = None
 
 
 class TestErrorHandling:
     """Test error handling and fallback mechanisms (Requirement 9.1-9.4)."""
     
-    def test_llm_unavailable_fallback_to_template(self):
+    def test_llm_unavailable_fallback_to_template(self, chatbot, default_profile):
         """Test that when LLM is unavailable, system falls back to template generation (Requirement 9.2)."""
-        # Create chatbot with no LLM available
-        chatbot = ChatbotEngine(
-            llm_engine=None,
-            meal_planner=None,
-            workout_planner=None,
-            use_ollama=False,
-            use_openai=False,
-            use_llm_generation=True
-        )
-        
         # Create user profile
-        profile = UserProfile(
-            name="Test User",
-            age=30,
-            weight_kg=70,
-            height_cm=175,
-            gender="male",
+        profile = dataclasses.replace(
+            default_profile,
             dietary_preferences=[DietaryPreference.VEGETARIAN],
             fitness_goals=[FitnessGoal.MUSCLE_GAIN],
             daily_calorie_target=2500
@@ -46,38 +56,22 @@ class TestErrorHandling:
         assert "plan_id" in response
         assert response["plan_type"] == "meal"
     
-    def test_parser_error_handling_invalid_format(self):
+    def test_parser_error_handling_invalid_format(self, default_profile):
         """Test that parser handles invalid format gracefully (Requirement 9.3)."""
         parser = PlanParser()
-        profile = UserProfile(
-            name="Test User",
-            age=30,
-            weight_kg=70,
-            height_cm=175,
-            gender="male",
-            daily_calorie_target=2000
-        )
         
         # Try to parse completely invalid text
         invalid_text = "This is not a meal plan at all. Just random text."
         
         with pytest.raises(ValueError) as exc_info:
-            parser.parse_meal_plan(invalid_text, profile)
+            parser.parse_meal_plan(invalid_text, default_profile)
         
         # Should have helpful error message
         assert "Could not extract any meals" in str(exc_info.value)
     
-    def test_parser_error_handling_partial_data(self):
+    def test_parser_error_handling_partial_data(self, default_profile):
         """Test that parser handles partial data gracefully (Requirement 9.3)."""
         parser = PlanParser()
-        profile = UserProfile(
-            name="Test User",
-            age=30,
-            weight_kg=70,
-            height_cm=175,
-            gender="male",
-            daily_calorie_target=2000
-        )
         
         # Meal plan with only one day and minimal info
         partial_text = """
@@ -86,110 +80,59 @@ class TestErrorHandling:
         """
         
         # Should parse successfully even with minimal data
-        meal_plan = parser.parse_meal_plan(partial_text, profile)
+        meal_plan = parser.parse_meal_plan(partial_text, default_profile)
         
         assert meal_plan is not None
         assert len(meal_plan.daily_plans) == 1
         assert meal_plan.daily_plans[0].breakfast is not None
     
-    def test_retry_logic_with_transient_error(self):
-        """Test that retry logic works for transient errors (Requirement 9.4)."""
-        chatbot = ChatbotEngine(
-            llm_engine=None,
-            meal_planner=None,
-            workout_planner=None,
-            use_ollama=False,
-            use_openai=False
-        )
-        
-        # Track call count
-        call_count = [0]
-        
-        def failing_operation():
-            call_count[0] += 1
-            if call_count[0] < 2:
-                raise RuntimeError("Timeout error - transient")
-            return "Success"
-        
-        # Should retry and succeed
-        result = chatbot._generate_with_retry(
-            failing_operation,
-            operation_name="test operation",
-            max_retries=2
-        )
-        
-        assert result == "Success"
-        assert call_count[0] == 2  # Failed once, succeeded on retry
-    
-    def test_retry_logic_with_non_transient_error(self):
-        """Test that non-transient errors are not retried (Requirement 9.4)."""
-        chatbot = ChatbotEngine(
-            llm_engine=None,
-            meal_planner=None,
-            workout_planner=None,
-            use_ollama=False,
-            use_openai=False
-        )
-        
-        # Track call count
-        call_count = [0]
-        
-        def failing_operation():
-            call_count[0] += 1
-            raise ValueError("Invalid input - not transient")
-        
-        # Should not retry non-transient errors
-        with pytest.raises(ValueError):
-            chatbot._generate_with_retry(
-                failing_operation,
+    @pytest.mark.parametrize(
+        "side_effect,max_retries,expected_calls,raises,logged",
+        [
+            # Transient errors are retried until the operation succeeds
+            ([RuntimeError("Timeout error - transient"), "Success"], 2, 2, None, True),
+            # Non-transient errors are raised straight away
+            (ValueError("Invalid input - not transient"), 2, 1, ValueError, False),
+            # Exhausted retries are logged for debugging
+            (RuntimeError("Test error for logging"), 0, 1, RuntimeError, True),
+        ],
+        ids=["transient", "non_transient", "logging"],
+    )
+    def test_retry_logic(
+        self, chatbot_no_llm, caplog, side_effect, max_retries, expected_calls, raises, logged
+    ):
+        """Test retry handling of transient, non-transient and exhausted errors (Requirement 9.4)."""
+        operation = Mock(side_effect=side_effect)
+        # Record backoff delays instead of sleeping
+        waits = []
+        
+        if raises:
+            with pytest.raises(raises):
+                chatbot_no_llm._generate_with_retry(
+                    operation,
+                    operation_name="test operation",
+                    max_retries=max_retries,
+                    sleep_fn=waits.append
+                )
+        else:
+            result = chatbot_no_llm._generate_with_retry(
+                operation,
                 operation_name="test operation",
-                max_retries=2
+                max_retries=max_retries,
+                sleep_fn=waits.append
             )
+            assert result == "Success"
         
-        assert call_count[0] == 1  # Only called once, no retries
-    
-    def test_error_logging(self, capfd):
-        """Test that errors are logged for debugging (Requirement 9.4)."""
-        chatbot = ChatbotEngine(
-            llm_engine=None,
-            meal_planner=None,
-            workout_planner=None,
-            use_ollama=False,
-            use_openai=False
-        )
-        
-        def failing_operation():
-            raise RuntimeError("Test error for logging")
+        assert operation.call_count == expected_calls
+        assert len(waits) == expected_calls - 1
         
-        # Should log error
-        with pytest.raises(RuntimeError):
-            chatbot._generate_with_retry(
-                failing_operation,
-                operation_name="test operation",
-                max_retries=0
-            )
-        
-        # Check that error was logged
-        captured = capfd.readouterr()
-        assert "test operation failed" in captured.out.lower()
+        if logged:
+            assert "test operation failed" in caplog.text.lower()
     
-    def test_workout_plan_fallback(self):
+    def test_workout_plan_fallback(self, chatbot, default_profile):
         """Test that workout plan generation falls back to template when LLM fails."""
-        chatbot = ChatbotEngine(
-            llm_engine=None,
-            meal_planner=None,
-            workout_planner=None,
-            use_ollama=False,
-            use_openai=False,
-            use_llm_generation=True
-        )
-        
-        profile = UserProfile(
-            name="Test User",
-            age=30,
-            weight_kg=70,
-            height_cm=175,
-            gender="male",
+        profile = dataclasses.replace(
+            default_profile,
             fitness_goals=[FitnessGoal.MUSCLE_GAIN],
             available_equipment=["dumbbells"]
         )
@@ -2,12 +2,18 @@
 
 from datetime import date
 
+import pytest
+from hypothesis import given, settings, strategies as st
+
 from nutrifit.models.plan import DailyMealPlan
 from nutrifit.models.progress import ProgressEntry, ProgressTracker
 from nutrifit.models.recipe import Ingredient, NutritionInfo, Recipe
 from nutrifit.models.user import DietaryPreference, FitnessGoal, UserProfile
 from nutrifit.models.workout import Equipment, Exercise, ExerciseType, MuscleGroup, Workout
 
+# Fixed date so the tests don't depend on the clock or on day rollovers
+_TODAY = date(2024, 1, 1)
+
 
 class TestUserProfile:
     """Tests for UserProfile model."""
@@ -56,26 +62,38 @@ class TestUserProfile:
         assert profile_normal.daily_calorie_target is not None
         assert profile_weight_loss.daily_calorie_target < profile_normal.daily_calorie_target
 
-    def test_user_profile_serialization(self):
+    @settings(max_examples=25, derandomize=True)
+    @given(
+        age=st.integers(min_value=18, max_value=90),
+        weight_kg=st.floats(min_value=40, max_value=150),
+        height_cm=st.floats(min_value=140, max_value=210),
+        dietary_preferences=st.lists(
+            st.sampled_from(list(DietaryPreference)), max_size=3, unique=True
+        ).filter(
+            lambda prefs: not (
+                DietaryPreference.VEGAN in prefs and DietaryPreference.PESCATARIAN in prefs
+            )
+        ),
+        fitness_goals=st.lists(st.sampled_from(list(FitnessGoal)), max_size=2, unique=True),
+        allergies=st.lists(st.sampled_from(["nuts", "dairy", "gluten", "shellfish"]), unique=True),
+    )
+    def test_user_profile_serialization(
+        self, age, weight_kg, height_cm, dietary_preferences, fitness_goals, allergies
+    ):
         """Test user profile to_dict and from_dict."""
         profile = UserProfile(
             name="Test",
-            age=30,
-            weight_kg=70.0,
-            height_cm=175.0,
-            dietary_preferences=[DietaryPreference.VEGAN],
-            fitness_goals=[FitnessGoal.MUSCLE_GAIN],
-            allergies=["nuts"],
+            age=age,
+            weight_kg=weight_kg,
+            height_cm=height_cm,
+            dietary_preferences=dietary_preferences,
+            fitness_goals=fitness_goals,
+            allergies=allergies,
             pantry_items=["rice", "beans"],
         )
-        data = profile.to_dict()
-        restored = UserProfile.from_dict(data)
+        restored = UserProfile.from_dict(profile.to_dict())
 
-        assert restored.name == profile.name
-        assert restored.age == profile.age
-        assert restored.weight_kg == profile.weight_kg
-        assert DietaryPreference.VEGAN in restored.dietary_preferences
-        assert FitnessGoal.MUSCLE_GAIN in restored.fitness_goals
+        assert restored == profile
 
 
 class TestRecipe:
@@ -200,49 +218,60 @@ class TestWorkout:
         assert workout.total_duration_minutes == 30  # 20 + 5 warmup + 5 cooldown
 
 
-class TestMealPlan:
-    """Tests for meal plan models."""
+@pytest.fixture(scope="module")
+def oatmeal_breakfast():
+    """Create a breakfast recipe shared by the meal plan tests."""
+    return Recipe(
+        id="b_001",
+        name="Oatmeal",
+        description="Healthy oatmeal",
+        ingredients=[Ingredient("oats", 60, "g")],
+        instructions=["Cook oats"],
+        nutrition=NutritionInfo(calories=300, protein_g=10, carbs_g=50, fat_g=5),
+        prep_time_minutes=5,
+        cook_time_minutes=5,
+        servings=1,
+        meal_type="breakfast",
+    )
 
-    def test_daily_meal_plan(self):
-        """Test creating a daily meal plan."""
-        breakfast = Recipe(
-            id="b_001",
-            name="Oatmeal",
-            description="Healthy oatmeal",
-            ingredients=[Ingredient("oats", 60, "g")],
-            instructions=["Cook oats"],
-            nutrition=NutritionInfo(calories=300, protein_g=10, carbs_g=50, fat_g=5),
+
+@pytest.fixture(scope="module")
+def three_recipes():
+    """Create one breakfast, lunch and dinner recipe, in that order."""
+    return tuple(
+        Recipe(
+            id=f"r_{i}",
+            name=f"Recipe {i}",
+            description="Test",
+            ingredients=[],
+            instructions=[],
+            nutrition=NutritionInfo(calories=100, protein_g=5, carbs_g=15, fat_g=3),
             prep_time_minutes=5,
             cook_time_minutes=5,
             servings=1,
-            meal_type="breakfast",
+            meal_type=meal_type,
         )
-        plan = DailyMealPlan(date=date.today(), breakfast=breakfast)
+        for i, meal_type in enumerate(["breakfast", "lunch", "dinner"])
+    )
+
+
+class TestMealPlan:
+    """Tests for meal plan models."""
+
+    def test_daily_meal_plan(self, oatmeal_breakfast):
+        """Test creating a daily meal plan."""
+        plan = DailyMealPlan(date=_TODAY, breakfast=oatmeal_breakfast)
         assert plan.breakfast is not None
         assert plan.total_calories == 300
 
-    def test_meal_plan_get_all_recipes(self):
+    def test_meal_plan_get_all_recipes(self, three_recipes):
         """Test getting all recipes from a meal plan."""
-        recipes = [
-            Recipe(
-                id=f"r_{i}",
-                name=f"Recipe {i}",
-                description="Test",
-                ingredients=[],
-                instructions=[],
-                nutrition=NutritionInfo(calories=100, protein_g=5, carbs_g=15, fat_g=3),
-                prep_time_minutes=5,
-                cook_time_minutes=5,
-                servings=1,
-                meal_type=["breakfast", "lunch", "dinner"][i % 3],
-            )
-            for i in range(3)
-        ]
+        breakfast, lunch, dinner = three_recipes
         daily_plan = DailyMealPlan(
-            date=date.today(),
-            breakfast=recipes[0],
-            lunch=recipes[1],
-            dinner=recipes[2],
+            date=_TODAY,
+            breakfast=breakfast,
+            lunch=lunch,
+            dinner=dinner,
         )
         all_recipes = daily_plan.get_all_recipes()
         assert len(all_recipes) == 3
@@ -255,18 +284,32 @@ class TestProgressTracker:
         """Test adding a progress entry."""
         tracker = ProgressTracker(user_id="test_user")
         entry = ProgressEntry(
-            date=date.today(),
+            date=_TODAY,
             weight_kg=70.0,
             calories_consumed=2000,
         )
         tracker.add_entry(entry)
         assert len(tracker.entries) == 1
 
+    def test_add_entries_sorts_and_indexes_batch(self):
+        """Test adding a batch of entries out of date order."""
+        tracker = ProgressTracker(user_id="test_user")
+        first = ProgressEntry(date=date(2024, 1, 3), weight_kg=70.0)
+        tracker.add_entry(first)
+        tracker.add_entries([
+            ProgressEntry(date=date(2024, 1, 3), weight_kg=71.0),
+            ProgressEntry(date=date(2024, 1, 2), weight_kg=72.0),
+        ])
+
+        assert [e.date.day for e in tracker.entries] == [2, 3, 3]
+        assert tracker.get_entry_for_date(date(2024, 1, 3)) is first
+        assert tracker.get_entry_for_date(date(2024, 1, 2)).weight_kg == 72.0
+
     def test_progress_summary(self):
         """Test getting progress summary."""
         tracker = ProgressTracker(user_id="test_user")
         entry = ProgressEntry(
-            date=date.today(),
+            date=_TODAY,
             weight_kg=70.0,
             workouts_completed=1,
         )
@@ -278,7 +321,7 @@ class TestProgressTracker:
     def test_progress_serialization(self):
         """Test progress tracker serialization."""
         tracker = ProgressTracker(user_id="test_user")
-        tracker.add_entry(ProgressEntry(date=date.today(), weight_kg=70.0))
+        tracker.add_entry(ProgressEntry(date=_TODAY, weight_kg=70.0))
 
         data = tracker.to_dict()
         restored = ProgressTracker.from_dict(data)
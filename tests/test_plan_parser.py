@@ -7,13 +7,76 @@ from nutrifit.parsers.plan_parser import PlanParser
 from nutrifit.models.user import UserProfile, FitnessGoal, DietaryPreference
 
 
-@pytest.fixture
+_SINGLE_DAY_MEAL_TEXT = """
+    Here's your meal plan for today:
+    
+    🍳 Breakfast: Oatmeal with berries (~400 kcal, Protein: 15g, Carbs: 60g, Fat: 10g)
+    🥗 Lunch: Grilled chicken salad (~500 kcal, Protein: 40g, Carbs: 30g, Fat: 20g)
+    🍽️ Dinner: Salmon with vegetables (~600 kcal, Protein: 45g, Carbs: 40g, Fat: 25g)
+    🍎 Snack: Greek yogurt (~200 kcal, Protein: 15g, Carbs: 20g, Fat: 5g)
+    """
+
+_MULTI_DAY_MEAL_TEXT = """
+    **Day 1:**
+    🍳 Breakfast: Scrambled eggs (~350 kcal, Protein: 20g, Carbs: 10g, Fat: 25g)
+    🥗 Lunch: Turkey sandwich (~450 kcal, Protein: 30g, Carbs: 50g, Fat: 15g)
+    🍽️ Dinner: Pasta with marinara (~700 kcal, Protein: 25g, Carbs: 100g, Fat: 20g)
+    
+    **Day 2:**
+    🍳 Breakfast: Smoothie bowl (~400 kcal, Protein: 15g, Carbs: 70g, Fat: 10g)
+    🥗 Lunch: Quinoa salad (~500 kcal, Protein: 20g, Carbs: 60g, Fat: 20g)
+    🍽️ Dinner: Grilled steak (~650 kcal, Protein: 50g, Carbs: 30g, Fat: 35g)
+    """
+
+_WORKOUT_TEXT = """
+    **Day 1 - Upper Body:**
+    - Bench Press: 4 sets × 8 reps (Rest: 90s)
+    - Pull-ups: 3 sets × 10 reps (Rest: 60s)
+    - Shoulder Press: 3 sets × 12 reps (Rest: 60s)
+    - Bicep Curls: 3 sets × 15 reps (Rest: 45s)
+    
+    **Day 2 - Lower Body:**
+    - Squats: 4 sets × 10 reps (Rest: 90s)
+    - Deadlifts: 3 sets × 8 reps (Rest: 120s)
+    - Lunges: 3 sets × 12 reps (Rest: 60s)
+    - Calf Raises: 3 sets × 20 reps (Rest: 45s)
+    
+    **Day 3 - Rest Day:**
+    Active recovery - light stretching or walking
+    """
+
+_NO_MACROS_MEAL_TEXT = """
+    🍳 Breakfast: Pancakes (~500 kcal)
+    🥗 Lunch: Chicken wrap (~600 kcal)
+    🍽️ Dinner: Beef stir-fry (~700 kcal)
+    """
+
+_DURATION_WORKOUT_TEXT = """
+    **Day 1 - Cardio:**
+    - Running: 30 minutes
+    - Cycling: 20 minutes
+    - Jump Rope: 10 minutes
+    """
+
+_DAYS_EXTRACT_TEXT = """
+    **Day 1:**
+    Some content for day 1
+    
+    **Day 2:**
+    Some content for day 2
+    
+    **Day 3:**
+    Some content for day 3
+    """
+
+
+@pytest.fixture(scope="module")
 def parser():
     """Create a parser instance."""
     return PlanParser()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def user_profile():
     """Create a test user profile."""
     return UserProfile(
@@ -30,16 +93,7 @@ def user_profile():
 
 def test_parse_single_day_meal_plan(parser, user_profile):
     """Test parsing a single-day meal plan."""
-    llm_text = """
-    Here's your meal plan for today:
-    
-    🍳 Breakfast: Oatmeal with berries (~400 kcal, Protein: 15g, Carbs: 60g, Fat: 10g)
-    🥗 Lunch: Grilled chicken salad (~500 kcal, Protein: 40g, Carbs: 30g, Fat: 20g)
-    🍽️ Dinner: Salmon with vegetables (~600 kcal, Protein: 45g, Carbs: 40g, Fat: 25g)
-    🍎 Snack: Greek yogurt (~200 kcal, Protein: 15g, Carbs: 20g, Fat: 5g)
-    """
-    
-    meal_plan = parser.parse_meal_plan(llm_text, user_profile)
+    meal_plan = parser.parse_meal_plan(_SINGLE_DAY_MEAL_TEXT, user_profile)
     
     assert meal_plan is not None
     assert meal_plan.name.startswith("AI Generated Meal Plan")
@@ -59,19 +113,7 @@ def test_parse_single_day_meal_plan(parser, user_profile):
 
 def test_parse_multi_day_meal_plan(parser, user_profile):
     """Test parsing a multi-day meal plan."""
-    llm_text = """
-    **Day 1:**
-    🍳 Breakfast: Scrambled eggs (~350 kcal, Protein: 20g, Carbs: 10g, Fat: 25g)
-    🥗 Lunch: Turkey sandwich (~450 kcal, Protein: 30g, Carbs: 50g, Fat: 15g)
-    🍽️ Dinner: Pasta with marinara (~700 kcal, Protein: 25g, Carbs: 100g, Fat: 20g)
-    
-    **Day 2:**
-    🍳 Breakfast: Smoothie bowl (~400 kcal, Protein: 15g, Carbs: 70g, Fat: 10g)
-    🥗 Lunch: Quinoa salad (~500 kcal, Protein: 20g, Carbs: 60g, Fat: 20g)
-    🍽️ Dinner: Grilled steak (~650 kcal, Protein: 50g, Carbs: 30g, Fat: 35g)
-    """
-    
-    meal_plan = parser.parse_meal_plan(llm_text, user_profile)
+    meal_plan = parser.parse_meal_plan(_MULTI_DAY_MEAL_TEXT, user_profile)
     
     assert meal_plan is not None
     assert len(meal_plan.daily_plans) == 2
@@ -90,24 +132,7 @@ def test_parse_multi_day_meal_plan(parser, user_profile):
 
 def test_parse_workout_plan(parser, user_profile):
     """Test parsing a workout plan."""
-    llm_text = """
-    **Day 1 - Upper Body:**
-    - Bench Press: 4 sets × 8 reps (Rest: 90s)
-    - Pull-ups: 3 sets × 10 reps (Rest: 60s)
-    - Shoulder Press: 3 sets × 12 reps (Rest: 60s)
-    - Bicep Curls: 3 sets × 15 reps (Rest: 45s)
-    
-    **Day 2 - Lower Body:**
-    - Squats: 4 sets × 10 reps (Rest: 90s)
-    - Deadlifts: 3 sets × 8 reps (Rest: 120s)
-    - Lunges: 3 sets × 12 reps (Rest: 60s)
-    - Calf Raises: 3 sets × 20 reps (Rest: 45s)
-    
-    **Day 3 - Rest Day:**
-    Active recovery - light stretching or walking
-    """
-    
-    workout_plan = parser.parse_workout_plan(llm_text, user_profile)
+    workout_plan = parser.parse_workout_plan(_WORKOUT_TEXT, user_profile)
     
     assert workout_plan is not None
     assert workout_plan.name.startswith("AI Generated Workout Plan")
@@ -134,13 +159,7 @@ def test_parse_workout_plan(parser, user_profile):
 
 def test_parse_meal_plan_without_macros(parser, user_profile):
     """Test parsing a meal plan without explicit macro information."""
-    llm_text = """
-    🍳 Breakfast: Pancakes (~500 kcal)
-    🥗 Lunch: Chicken wrap (~600 kcal)
-    🍽️ Dinner: Beef stir-fry (~700 kcal)
-    """
-    
-    meal_plan = parser.parse_meal_plan(llm_text, user_profile)
+    meal_plan = parser.parse_meal_plan(_NO_MACROS_MEAL_TEXT, user_profile)
     
     assert meal_plan is not None
     assert len(meal_plan.daily_plans) == 1
@@ -154,14 +173,7 @@ def test_parse_meal_plan_without_macros(parser, user_profile):
 
 def test_parse_workout_with_duration(parser, user_profile):
     """Test parsing a workout with duration-based exercises."""
-    llm_text = """
-    **Day 1 - Cardio:**
-    - Running: 30 minutes
-    - Cycling: 20 minutes
-    - Jump Rope: 10 minutes
-    """
-    
-    workout_plan = parser.parse_workout_plan(llm_text, user_profile)
+    workout_plan = parser.parse_workout_plan(_DURATION_WORKOUT_TEXT, user_profile)
     
     assert workout_plan is not None
     assert len(workout_plan.daily_plans) == 1
@@ -200,18 +212,7 @@ def test_estimate_macros(parser):
 
 def test_extract_days(parser):
     """Test day extraction from text."""
-    text = """
-    **Day 1:**
-    Some content for day 1
-    
-    **Day 2:**
-    Some content for day 2
-    
-    **Day 3:**
-    Some content for day 3
-    """
-    
-    days = parser._extract_days(text)
+    days = parser._extract_days(_DAYS_EXTRACT_TEXT)
     
     assert len(days) == 3
     assert 1 in days
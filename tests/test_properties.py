@@ -4,25 +4,95 @@ Feature: nutrifit-ai-assistant
 """
 
 import json
+from collections import Counter
+from dataclasses import replace
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 
-from hypothesis import given, settings, strategies as st, HealthCheck, assume
+import numpy as np
+from hypothesis import example, given, settings, strategies as st, assume
 
+from nutrifit.data.recipes import get_sample_recipes
+from nutrifit.data.workouts import get_sample_workouts
+from nutrifit.engines.embedding_engine import EmbeddingEngine
+from nutrifit.engines.llm_engine import LocalLLMEngine
+from nutrifit.engines.meal_planner import MealPlannerEngine
+from nutrifit.engines.workout_planner import WorkoutPlannerEngine
 from nutrifit.models.plan import DailyMealPlan, DailyWorkoutPlan, MealPlan, WorkoutPlan
 from nutrifit.models.progress import ProgressEntry, ProgressTracker
 from nutrifit.models.recipe import Ingredient, NutritionInfo, Recipe
 from nutrifit.models.user import DietaryPreference, FitnessGoal, UserProfile
 from nutrifit.models.workout import Equipment, Exercise, ExerciseType, MuscleGroup, Workout
+from nutrifit.utils.shopping_list import ShoppingListOptimizer
+
+
+# Example budgets: cheap round-trip properties get the full 100 examples, those
+# that build engines or generate plans per example get fewer
+_CHEAP = settings(max_examples=100)
+_EXPENSIVE = settings(max_examples=25)
+# Structural invariants (plan durations, list consolidation) that only need a
+# few planner runs once the boundary cases are pinned with @example
+_STRUCTURAL = settings(max_examples=10)
+
+
+def _floats32(min_value, max_value):
+    """Finite single-precision floats for bounded, human-scale quantities.
+
+    Bounds must be exactly representable at 32-bit width.
+    """
+    return st.floats(
+        min_value=min_value,
+        max_value=max_value,
+        allow_nan=False,
+        allow_infinity=False,
+        width=32,
+    )
 
 
 # Strategy builders for generating valid test data
 
+# Leaf strategies shared by the builders below, built once instead of per draw
+# Everything str.strip() removes is in Z* or Cc, so text drawn from this
+# alphabet is non-blank by construction rather than by filtering
+_NON_WS_CHARS = st.characters(blacklist_categories=("Cs", "Zs", "Zl", "Zp", "Cc"))
+_NON_BLANK_20 = st.text(alphabet=_NON_WS_CHARS, min_size=1, max_size=20)
+_NON_BLANK_30 = st.text(alphabet=_NON_WS_CHARS, min_size=1, max_size=30)
+_NON_BLANK_50 = st.text(alphabet=_NON_WS_CHARS, min_size=1, max_size=50)
+_NON_BLANK_100 = st.text(alphabet=_NON_WS_CHARS, min_size=1, max_size=100)
+# Free-text fields (descriptions, instructions, tags, notes) are opaque to the
+# models, so they draw from printable ASCII; names and ids above keep the full
+# non-blank Unicode range for the round-trip properties. The round-trips check
+# structure, not payload size, so these stay short to keep draws and shrinks cheap
+_ASCII_CHARS = st.characters(min_codepoint=32, max_codepoint=126)
+_LABEL_20 = st.text(alphabet=_ASCII_CHARS, min_size=1, max_size=20)
+_LABEL_30 = st.text(alphabet=_ASCII_CHARS, min_size=1, max_size=30)
+_NOTES = st.text(alphabet=_ASCII_CHARS, max_size=20)
+_GENDERS = st.sampled_from(["male", "female"])
+_DIET_PREF_LISTS = st.lists(st.sampled_from(list(DietaryPreference)), max_size=3, unique=True)
+_FITNESS_GOAL_LISTS = st.lists(st.sampled_from(list(FitnessGoal)), max_size=3, unique=True)
+_CALORIE_TARGETS = st.one_of(st.none(), st.integers(min_value=500, max_value=15000))
+_UNITS = st.sampled_from(["g", "kg", "ml", "l", "cup", "tbsp", "tsp", "oz", "lb"])
+_MEAL_TYPES = st.sampled_from(["breakfast", "lunch", "dinner", "snack"])
+# Body measurements behind the goal-adjustment properties (3 and 4), drawn as
+# one dict so both build their profile the same way
+_BASELINE_INPUTS = st.fixed_dictionaries({
+    "age": st.integers(min_value=18, max_value=100),
+    "weight_kg": _floats32(min_value=40, max_value=200),
+    "height_cm": _floats32(min_value=140, max_value=220),
+    "gender": _GENDERS,
+})
+_EQUIPMENT_CATEGORIES = st.sampled_from(["free_weights", "machines", "bodyweight", "cardio"])
+_MUSCLE_GROUP_LISTS = st.lists(
+    st.sampled_from(list(MuscleGroup)), min_size=1, max_size=3, unique=True
+)
+_EXERCISE_TYPES = st.sampled_from(list(ExerciseType))
+_DIFFICULTIES = st.sampled_from(["beginner", "intermediate", "advanced"])
+
 @st.composite
 def dietary_preferences(draw):
     """Generate a list of compatible dietary preferences."""
-    all_prefs = list(DietaryPreference)
     # Avoid incompatible combinations
-    prefs = draw(st.lists(st.sampled_from(all_prefs), max_size=3, unique=True))
+    prefs = draw(_DIET_PREF_LISTS)
     
     # Remove incompatible combinations
     if DietaryPreference.VEGAN in prefs and DietaryPreference.PESCATARIAN in prefs:
@@ -31,168 +101,214 @@ def dietary_preferences(draw):
     return prefs
 
 
-@st.composite
-def user_profiles(draw):
-    """Generate valid UserProfile instances."""
-    name = draw(st.text(min_size=1, max_size=50).filter(lambda x: x.strip()))
-    age = draw(st.integers(min_value=1, max_value=150))
-    weight_kg = draw(st.floats(min_value=1, max_value=500))
-    height_cm = draw(st.floats(min_value=1, max_value=300))
-    gender = draw(st.sampled_from(["male", "female"]))
-    dietary_prefs = draw(dietary_preferences())
-    fitness_goals = draw(st.lists(st.sampled_from(list(FitnessGoal)), max_size=3, unique=True))
-    allergies = draw(st.lists(st.text(min_size=1, max_size=20), max_size=5))
-    pantry_items = draw(st.lists(st.text(min_size=1, max_size=30), max_size=20))
-    equipment = draw(st.lists(st.text(min_size=1, max_size=30), max_size=10))
-    meals_per_day = draw(st.integers(min_value=1, max_value=10))
-    
+# Model strategies map drawn fields straight onto constructor kwargs, so they
+# use st.builds: no composite closure or per-field draw() call per example
+user_profiles = st.builds(
+    UserProfile,
+    name=_NON_BLANK_50,
+    # Bounded so the BMR-derived target is never negative, which keeps every
+    # drawn profile valid instead of discarding the odd ones with assume()
+    age=st.integers(min_value=1, max_value=120),
+    weight_kg=_floats32(min_value=30, max_value=500),
+    height_cm=_floats32(min_value=100, max_value=300),
+    gender=_GENDERS,
+    dietary_preferences=dietary_preferences(),
+    fitness_goals=_FITNESS_GOAL_LISTS,
+    allergies=st.lists(_LABEL_20, max_size=5),
+    pantry_items=st.lists(_LABEL_30, max_size=8),
+    available_equipment=st.lists(_LABEL_30, max_size=8),
+    meals_per_day=st.integers(min_value=1, max_value=10),
     # Either let the system calculate the calorie target (None) or provide a valid one
-    daily_calorie_target = draw(
-        st.one_of(
-            st.none(),
-            st.integers(min_value=500, max_value=15000)
-        )
-    )
-    
-    return UserProfile(
-        name=name,
-        age=age,
-        weight_kg=weight_kg,
-        height_cm=height_cm,
-        gender=gender,
-        dietary_preferences=dietary_prefs,
-        fitness_goals=fitness_goals,
-        allergies=allergies,
-        pantry_items=pantry_items,
-        available_equipment=equipment,
-        meals_per_day=meals_per_day,
-        daily_calorie_target=daily_calorie_target,
-    )
+    daily_calorie_target=_CALORIE_TARGETS,
+)
 
+nutrition_infos = st.builds(
+    NutritionInfo,
+    calories=st.integers(min_value=0, max_value=5000),
+    protein_g=_floats32(min_value=0, max_value=500),
+    carbs_g=_floats32(min_value=0, max_value=500),
+    fat_g=_floats32(min_value=0, max_value=500),
+    fiber_g=_floats32(min_value=0, max_value=100),
+    sugar_g=_floats32(min_value=0, max_value=200),
+    sodium_mg=_floats32(min_value=0, max_value=5000),
+)
 
-@st.composite
-def nutrition_infos(draw):
-    """Generate valid NutritionInfo instances."""
-    return NutritionInfo(
-        calories=draw(st.integers(min_value=0, max_value=5000)),
-        protein_g=draw(st.floats(min_value=0, max_value=500)),
-        carbs_g=draw(st.floats(min_value=0, max_value=500)),
-        fat_g=draw(st.floats(min_value=0, max_value=500)),
-        fiber_g=draw(st.floats(min_value=0, max_value=100)),
-        sugar_g=draw(st.floats(min_value=0, max_value=200)),
-        sodium_mg=draw(st.floats(min_value=0, max_value=5000)),
-    )
+ingredients = st.builds(
+    Ingredient,
+    name=_NON_BLANK_50,
+    quantity=_floats32(min_value=0.125, max_value=1000),
+    unit=_UNITS,
+    optional=st.booleans(),
+)
 
 
-@st.composite
-def ingredients(draw):
-    """Generate valid Ingredient instances."""
-    return Ingredient(
-        name=draw(st.text(min_size=1, max_size=50).filter(lambda x: x.strip())),
-        quantity=draw(st.floats(min_value=0.1, max_value=1000)),
-        unit=draw(st.sampled_from(["g", "kg", "ml", "l", "cup", "tbsp", "tsp", "oz", "lb"])),
-        optional=draw(st.booleans()),
-    )
+recipes = st.builds(
+    Recipe,
+    id=_NON_BLANK_20,
+    name=_NON_BLANK_100,
+    description=_LABEL_30,
+    ingredients=st.lists(ingredients, min_size=1, max_size=10),
+    instructions=st.lists(_LABEL_20, min_size=1, max_size=5),
+    nutrition=nutrition_infos,
+    prep_time_minutes=st.integers(min_value=0, max_value=300),
+    cook_time_minutes=st.integers(min_value=0, max_value=300),
+    servings=st.integers(min_value=1, max_value=20),
+    meal_type=_MEAL_TYPES,
+    tags=st.lists(_LABEL_20, max_size=5),
+    dietary_info=st.lists(_LABEL_20, max_size=5),
+)
 
+equipments = st.builds(
+    Equipment,
+    name=_NON_BLANK_50,
+    category=_EQUIPMENT_CATEGORIES,
+    is_required=st.booleans(),
+)
 
-@st.composite
-def recipes(draw):
-    """Generate valid Recipe instances."""
-    recipe_id = draw(st.text(min_size=1, max_size=20).filter(lambda x: x.strip()))
-    name = draw(st.text(min_size=1, max_size=100).filter(lambda x: x.strip()))
-    description = draw(st.text(min_size=1, max_size=500))
-    ingredient_list = draw(st.lists(ingredients(), min_size=1, max_size=10))
-    instructions = draw(st.lists(st.text(min_size=1, max_size=200), min_size=1, max_size=10))
-    nutrition = draw(nutrition_infos())
-    prep_time = draw(st.integers(min_value=0, max_value=300))
-    cook_time = draw(st.integers(min_value=0, max_value=300))
-    servings = draw(st.integers(min_value=1, max_value=20))
-    meal_type = draw(st.sampled_from(["breakfast", "lunch", "dinner", "snack"]))
-    
-    return Recipe(
-        id=recipe_id,
-        name=name,
-        description=description,
-        ingredients=ingredient_list,
-        instructions=instructions,
-        nutrition=nutrition,
-        prep_time_minutes=prep_time,
-        cook_time_minutes=cook_time,
-        servings=servings,
-        meal_type=meal_type,
-        tags=draw(st.lists(st.text(min_size=1, max_size=20), max_size=5)),
-        dietary_info=draw(st.lists(st.text(min_size=1, max_size=20), max_size=5)),
-    )
 
+exercises = st.builds(
+    Exercise,
+    id=_NON_BLANK_20,
+    name=_NON_BLANK_100,
+    description=_LABEL_30,
+    muscle_groups=_MUSCLE_GROUP_LISTS,
+    exercise_type=_EXERCISE_TYPES,
+    equipment_needed=st.lists(equipments, max_size=3),
+    sets=st.integers(min_value=1, max_value=10),
+    reps=st.one_of(st.none(), st.integers(min_value=1, max_value=100)),
+    duration_seconds=st.one_of(st.none(), st.integers(min_value=1, max_value=3600)),
+    rest_seconds=st.integers(min_value=0, max_value=300),
+    difficulty=_DIFFICULTIES,
+    instructions=st.lists(_LABEL_20, max_size=5),
+    tips=st.lists(_LABEL_20, max_size=5),
+    calories_per_minute=_floats32(min_value=0, max_value=20),
+)
 
-@st.composite
-def equipments(draw):
-    """Generate valid Equipment instances."""
-    return Equipment(
-        name=draw(st.text(min_size=1, max_size=50).filter(lambda x: x.strip())),
-        category=draw(st.sampled_from(["free_weights", "machines", "bodyweight", "cardio"])),
-        is_required=draw(st.booleans()),
-    )
+progress_entries = st.builds(
+    ProgressEntry,
+    date=st.dates(min_value=date(2020, 1, 1), max_value=date(2030, 12, 31)),
+    weight_kg=st.one_of(st.none(), _floats32(min_value=1, max_value=500)),
+    body_fat_percentage=st.one_of(st.none(), _floats32(min_value=0, max_value=100)),
+    calories_consumed=st.one_of(st.none(), st.integers(min_value=0, max_value=10000)),
+    calories_burned=st.one_of(st.none(), st.integers(min_value=0, max_value=10000)),
+    workouts_completed=st.integers(min_value=0, max_value=10),
+    meals_followed=st.integers(min_value=0, max_value=10),
+    water_intake_ml=st.one_of(st.none(), st.integers(min_value=0, max_value=10000)),
+    sleep_hours=st.one_of(st.none(), _floats32(min_value=0, max_value=24)),
+    mood_rating=st.one_of(st.none(), st.integers(min_value=1, max_value=10)),
+    energy_rating=st.one_of(st.none(), st.integers(min_value=1, max_value=10)),
+    notes=_NOTES,
+)
 
 
-@st.composite
-def exercises(draw):
-    """Generate valid Exercise instances."""
-    exercise_id = draw(st.text(min_size=1, max_size=20).filter(lambda x: x.strip()))
-    name = draw(st.text(min_size=1, max_size=100).filter(lambda x: x.strip()))
-    description = draw(st.text(min_size=1, max_size=500))
-    muscle_groups = draw(st.lists(st.sampled_from(list(MuscleGroup)), min_size=1, max_size=3, unique=True))
-    exercise_type = draw(st.sampled_from(list(ExerciseType)))
-    equipment_list = draw(st.lists(equipments(), max_size=3))
-    sets = draw(st.integers(min_value=1, max_value=10))
-    reps = draw(st.one_of(st.none(), st.integers(min_value=1, max_value=100)))
-    duration_seconds = draw(st.one_of(st.none(), st.integers(min_value=1, max_value=3600)))
-    rest_seconds = draw(st.integers(min_value=0, max_value=300))
-    difficulty = draw(st.sampled_from(["beginner", "intermediate", "advanced"]))
-    
-    return Exercise(
-        id=exercise_id,
-        name=name,
-        description=description,
-        muscle_groups=muscle_groups,
-        exercise_type=exercise_type,
-        equipment_needed=equipment_list,
-        sets=sets,
-        reps=reps,
-        duration_seconds=duration_seconds,
-        rest_seconds=rest_seconds,
-        difficulty=difficulty,
-        instructions=draw(st.lists(st.text(min_size=1, max_size=200), max_size=5)),
-        tips=draw(st.lists(st.text(min_size=1, max_size=200), max_size=5)),
-        calories_per_minute=draw(st.floats(min_value=0, max_value=20)),
+@lru_cache(maxsize=1)
+def _shared_engines():
+    """Build the embedding engine and template LLM once for the whole module.
+
+    The template LLM avoids loading models; both planners below share the pair.
+    """
+    return EmbeddingEngine(), LocalLLMEngine(use_fallback=True)
+
+
+@lru_cache(maxsize=1)
+def _sample_meal_planner():
+    """Build one meal planner over the sample recipes for the whole module.
+
+    Planners keep no per-call state, so every example can share it instead of
+    re-embedding the recipes.
+    """
+    embedding_engine, llm_engine = _shared_engines()
+    return MealPlannerEngine(
+        embedding_engine=embedding_engine,
+        llm_engine=llm_engine,
+        recipes=get_sample_recipes(),
     )
 
 
-@st.composite
-def progress_entries(draw):
-    """Generate valid ProgressEntry instances."""
-    entry_date = draw(st.dates(min_value=date(2020, 1, 1), max_value=date(2030, 12, 31)))
-    
-    return ProgressEntry(
-        date=entry_date,
-        weight_kg=draw(st.one_of(st.none(), st.floats(min_value=1, max_value=500))),
-        body_fat_percentage=draw(st.one_of(st.none(), st.floats(min_value=0, max_value=100))),
-        calories_consumed=draw(st.one_of(st.none(), st.integers(min_value=0, max_value=10000))),
-        calories_burned=draw(st.one_of(st.none(), st.integers(min_value=0, max_value=10000))),
-        workouts_completed=draw(st.integers(min_value=0, max_value=10)),
-        meals_followed=draw(st.integers(min_value=0, max_value=10)),
-        water_intake_ml=draw(st.one_of(st.none(), st.integers(min_value=0, max_value=10000))),
-        sleep_hours=draw(st.one_of(st.none(), st.floats(min_value=0, max_value=24))),
-        mood_rating=draw(st.one_of(st.none(), st.integers(min_value=1, max_value=10))),
-        energy_rating=draw(st.one_of(st.none(), st.integers(min_value=1, max_value=10))),
-        notes=draw(st.text(max_size=500)),
+@lru_cache(maxsize=1)
+def _sample_workout_planner():
+    """Build one workout planner over the sample workouts for the whole module."""
+    embedding_engine, llm_engine = _shared_engines()
+    return WorkoutPlannerEngine(
+        embedding_engine=embedding_engine,
+        llm_engine=llm_engine,
+        workouts=get_sample_workouts(),
     )
 
 
+class _ProfileKey:
+    """Hashable stand-in for a profile that compares by its field values.
+
+    Profiles are mutable dataclasses and so unhashable; this lets lru_cache
+    treat structurally equal profiles drawn by different properties (or
+    replayed while shrinking) as the same key.
+    """
+
+    __slots__ = ("profile", "_fields")
+
+    def __init__(self, profile):
+        self.profile = profile
+        self._fields = repr(profile)
+
+    def __eq__(self, other):
+        return isinstance(other, _ProfileKey) and self._fields == other._fields
+
+    def __hash__(self):
+        return hash(self._fields)
+
+
+@lru_cache(maxsize=512)
+def _cached_daily_plan(planner, profile_key, plan_date):
+    """Generate one daily plan per (planner, profile fields, date)."""
+    return planner.generate_daily_plan(profile_key.profile, plan_date)
+
+
+def _daily_plan(planner, profile, plan_date):
+    """Return the planner's daily plan for this profile and date, memoized.
+
+    Workout plans use the planner's default day_number of 0. Callers must not
+    mutate the returned plan.
+    """
+    return _cached_daily_plan(planner, _ProfileKey(profile), plan_date)
+
+
+def _name_index(names):
+    """Join names with NUL so one substring scan covers all of them.
+
+    Neither the generated names (no control characters) nor the sample data
+    contain NUL, so a match cannot straddle two names: `x in _name_index(names)`
+    equals `any(x in name for name in names)`.
+    """
+    return "\0".join(names)
+
+
+def _overlaps(name, names, index):
+    """Whether name is a substring of any of names, or any of them is one of it."""
+    return name in index or any(other in name for other in names)
+
+
+def _available_equipment(profile):
+    """Lowercased equipment the profile can use, bodyweight included."""
+    return frozenset(e.lower() for e in profile.available_equipment) | {"bodyweight", "none"}
+
+
+# Calories per gram of protein, carbs and fat, in that order
+_CALORIES_PER_GRAM = np.array([4.0, 4.0, 9.0])
+
+
+# Recipe dietary tags that satisfy each preference: vegetarian accepts vegan
+# recipes, pescatarian accepts vegetarian and vegan ones
+_DIET_ACCEPTED_TAGS = {
+    "vegetarian": frozenset({"vegetarian", "vegan"}),
+    "vegan": frozenset({"vegan"}),
+    "pescatarian": frozenset({"pescatarian", "vegetarian", "vegan"}),
+}
+
+
 # Property-Based Tests
 
-@settings(max_examples=100, suppress_health_check=[HealthCheck.too_slow], database=None)
-@given(profile=user_profiles())
+@_CHEAP
+@given(profile=user_profiles)
 def test_property_1_user_profile_persistence_round_trip(profile):
     """Feature: nutrifit-ai-assistant, Property 1: Dietary Preference Persistence Round-Trip
     
@@ -201,33 +317,18 @@ def test_property_1_user_profile_persistence_round_trip(profile):
     
     Validates: Requirements 1.1, 1.3
     """
-    # Ensure the profile is valid
-    assume(profile.is_valid_structure())
-    
     # Serialize to dict (simulating storage)
     data = profile.to_dict()
     
     # Deserialize from dict (simulating loading)
     restored = UserProfile.from_dict(data)
     
-    # Check that all fields match
-    assert restored.name == profile.name
-    assert restored.age == profile.age
-    assert restored.weight_kg == profile.weight_kg
-    assert restored.height_cm == profile.height_cm
-    assert restored.gender == profile.gender
-    assert restored.dietary_preferences == profile.dietary_preferences
-    assert restored.fitness_goals == profile.fitness_goals
-    assert restored.allergies == profile.allergies
-    assert restored.pantry_items == profile.pantry_items
-    assert restored.available_equipment == profile.available_equipment
-    assert restored.meals_per_day == profile.meals_per_day
-    # Note: daily_calorie_target is calculated, so it should match
-    assert restored.daily_calorie_target == profile.daily_calorie_target
+    # Check that all fields match, including the calculated calorie target
+    assert restored == profile
 
 
-@settings(max_examples=100, suppress_health_check=[HealthCheck.too_slow], database=None)
-@given(profile=user_profiles())
+@_CHEAP
+@given(profile=user_profiles)
 def test_property_30_data_storage_format_validity(profile):
     """Feature: nutrifit-ai-assistant, Property 30: Data Storage Format Validity
     
@@ -238,24 +339,16 @@ def test_property_30_data_storage_format_validity(profile):
     # Serialize to dict
     data = profile.to_dict()
     
-    # Try to serialize to JSON (this will raise an exception if not valid)
-    json_str = json.dumps(data)
-    
-    # Verify we can parse it back
-    parsed = json.loads(json_str)
-    
-    # Verify the parsed data is a dictionary
-    assert isinstance(parsed, dict)
+    # Serializing proves the data is valid JSON; allow_nan=False rejects the
+    # NaN/Infinity literals json.dumps would otherwise emit
+    json.dumps(data, allow_nan=False)
     
     # Verify key fields are present
-    assert "name" in parsed
-    assert "age" in parsed
-    assert "weight_kg" in parsed
-    assert "height_cm" in parsed
+    assert {"name", "age", "weight_kg", "height_cm"} <= data.keys()
 
 
-@settings(max_examples=100, suppress_health_check=[HealthCheck.too_slow], database=None)
-@given(profile=user_profiles())
+@_CHEAP
+@given(profile=user_profiles)
 def test_property_31_data_structure_validation_before_persistence(profile):
     """Feature: nutrifit-ai-assistant, Property 31: Data Structure Validation Before Persistence
     
@@ -264,10 +357,7 @@ def test_property_31_data_structure_validation_before_persistence(profile):
     
     Validates: Requirements 12.4
     """
-    # Ensure the profile is valid
-    assume(profile.is_valid_structure())
-    
-    # Valid profile should pass validation
+    # UserProfile validates in __post_init__, so every drawn profile must pass
     assert profile.is_valid_structure() is True
     
     # The profile should have been validated during construction
@@ -283,7 +373,7 @@ def test_property_31_data_structure_validation_before_persistence(profile):
 
 
 @settings(max_examples=100)
-@given(entry=progress_entries())
+@given(entry=progress_entries)
 def test_property_26_progress_data_persistence_round_trip(entry):
     """Feature: nutrifit-ai-assistant, Property 26: Progress Data Persistence Round-Trip
     
@@ -292,9 +382,8 @@ def test_property_26_progress_data_persistence_round_trip(entry):
     
     Validates: Requirements 8.5
     """
-    # Create a tracker with the entry
-    tracker = ProgressTracker(user_id="test_user")
-    tracker.add_entry(entry)
+    # Create a tracker holding just this entry (nothing to sort)
+    tracker = ProgressTracker(user_id="test_user", entries=[entry])
     
     # Serialize to dict
     data = tracker.to_dict()
@@ -302,23 +391,12 @@ def test_property_26_progress_data_persistence_round_trip(entry):
     # Deserialize from dict
     restored = ProgressTracker.from_dict(data)
     
-    # Check that fields match
-    assert restored.user_id == tracker.user_id
-    assert len(restored.entries) == len(tracker.entries)
-    
-    # Check the entry details
-    restored_entry = restored.entries[0]
-    assert restored_entry.date == entry.date
-    assert restored_entry.weight_kg == entry.weight_kg
-    assert restored_entry.body_fat_percentage == entry.body_fat_percentage
-    assert restored_entry.calories_consumed == entry.calories_consumed
-    assert restored_entry.calories_burned == entry.calories_burned
-    assert restored_entry.workouts_completed == entry.workouts_completed
-    assert restored_entry.meals_followed == entry.meals_followed
+    # Check that the tracker and its entry match
+    assert restored == tracker
 
 
 @settings(max_examples=100)
-@given(recipe=recipes())
+@given(recipe=recipes)
 def test_recipe_persistence_round_trip(recipe):
     """Test that recipes can be serialized and deserialized correctly."""
     # Serialize to dict
@@ -328,20 +406,11 @@ def test_recipe_persistence_round_trip(recipe):
     restored = Recipe.from_dict(data)
     
     # Check that all fields match
-    assert restored.id == recipe.id
-    assert restored.name == recipe.name
-    assert restored.description == recipe.description
-    assert len(restored.ingredients) == len(recipe.ingredients)
-    assert len(restored.instructions) == len(recipe.instructions)
-    assert restored.nutrition.calories == recipe.nutrition.calories
-    assert restored.prep_time_minutes == recipe.prep_time_minutes
-    assert restored.cook_time_minutes == recipe.cook_time_minutes
-    assert restored.servings == recipe.servings
-    assert restored.meal_type == recipe.meal_type
+    assert restored == recipe
 
 
 @settings(max_examples=100)
-@given(exercise=exercises())
+@given(exercise=exercises)
 def test_exercise_persistence_round_trip(exercise):
     """Test that exercises can be serialized and deserialized correctly."""
     # Serialize to dict
@@ -351,20 +420,11 @@ def test_exercise_persistence_round_trip(exercise):
     restored = Exercise.from_dict(data)
     
     # Check that all fields match
-    assert restored.id == exercise.id
-    assert restored.name == exercise.name
-    assert restored.description == exercise.description
-    assert restored.muscle_groups == exercise.muscle_groups
-    assert restored.exercise_type == exercise.exercise_type
-    assert restored.sets == exercise.sets
-    assert restored.reps == exercise.reps
-    assert restored.duration_seconds == exercise.duration_seconds
-    assert restored.rest_seconds == exercise.rest_seconds
-    assert restored.difficulty == exercise.difficulty
-
-
-@settings(max_examples=100, suppress_health_check=[HealthCheck.too_slow], database=None)
-@given(pantry_items=st.lists(st.text(min_size=1, max_size=30).filter(lambda x: x.strip()), max_size=50))
+    assert restored == exercise
+
+
+@_CHEAP
+@given(pantry_items=st.lists(_NON_BLANK_30, max_size=20))
 def test_property_6_ingredient_inventory_persistence_round_trip(pantry_items):
     """Feature: nutrifit-ai-assistant, Property 6: Ingredient Inventory Persistence Round-Trip
     
@@ -397,14 +457,9 @@ def test_property_6_ingredient_inventory_persistence_round_trip(pantry_items):
         assert item in restored.pantry_items
 
 
-@settings(max_examples=100, suppress_health_check=[HealthCheck.too_slow], database=None)
-@given(
-    age=st.integers(min_value=18, max_value=100),
-    weight_kg=st.floats(min_value=40, max_value=200),
-    height_cm=st.floats(min_value=140, max_value=220),
-    gender=st.sampled_from(["male", "female"]),
-)
-def test_property_3_fitness_goal_caloric_adjustment(age, weight_kg, height_cm, gender):
+@_CHEAP
+@given(inputs=_BASELINE_INPUTS)
+def test_property_3_fitness_goal_caloric_adjustment(inputs):
     """Feature: nutrifit-ai-assistant, Property 3: Fitness Goal Caloric Adjustment
     
     For any user profile, when the fitness goal is set to weight loss, the calculated 
@@ -414,37 +469,15 @@ def test_property_3_fitness_goal_caloric_adjustment(age, weight_kg, height_cm, g
     Validates: Requirements 2.2
     """
     # Create a baseline profile with maintenance goal
-    baseline_profile = UserProfile(
-        name="Test User",
-        age=age,
-        weight_kg=weight_kg,
-        height_cm=height_cm,
-        gender=gender,
-        fitness_goals=[FitnessGoal.MAINTENANCE],
-    )
-    baseline_calories = baseline_profile.daily_calorie_target
+    profile = UserProfile(name="Test User", fitness_goals=[FitnessGoal.MAINTENANCE], **inputs)
+    baseline_calories = profile.daily_calorie_target
     
-    # Create profile with weight loss goal
-    weight_loss_profile = UserProfile(
-        name="Test User",
-        age=age,
-        weight_kg=weight_kg,
-        height_cm=height_cm,
-        gender=gender,
-        fitness_goals=[FitnessGoal.WEIGHT_LOSS],
-    )
-    weight_loss_calories = weight_loss_profile.daily_calorie_target
+    # Recompute the target for the other goals on the same profile
+    profile.fitness_goals = [FitnessGoal.WEIGHT_LOSS]
+    weight_loss_calories = profile.calculate_calorie_target()
     
-    # Create profile with muscle gain goal
-    muscle_gain_profile = UserProfile(
-        name="Test User",
-        age=age,
-        weight_kg=weight_kg,
-        height_cm=height_cm,
-        gender=gender,
-        fitness_goals=[FitnessGoal.MUSCLE_GAIN],
-    )
-    muscle_gain_calories = muscle_gain_profile.daily_calorie_target
+    profile.fitness_goals = [FitnessGoal.MUSCLE_GAIN]
+    muscle_gain_calories = profile.calculate_calorie_target()
     
     # Verify weight loss calories are less than baseline
     assert weight_loss_calories < baseline_calories, (
@@ -476,14 +509,9 @@ def test_property_3_fitness_goal_caloric_adjustment(age, weight_kg, height_cm, g
     )
 
 
-@settings(max_examples=100, suppress_health_check=[HealthCheck.too_slow], database=None)
-@given(
-    age=st.integers(min_value=18, max_value=100),
-    weight_kg=st.floats(min_value=40, max_value=200),
-    height_cm=st.floats(min_value=140, max_value=220),
-    gender=st.sampled_from(["male", "female"]),
-)
-def test_property_4_fitness_goal_macro_nutrient_adjustment(age, weight_kg, height_cm, gender):
+@_CHEAP
+@given(inputs=_BASELINE_INPUTS)
+def test_property_4_fitness_goal_macro_nutrient_adjustment(inputs):
     """Feature: nutrifit-ai-assistant, Property 4: Fitness Goal Macro-Nutrient Adjustment
     
     For any user profile, different fitness goals should produce different macro-nutrient 
@@ -491,48 +519,18 @@ def test_property_4_fitness_goal_macro_nutrient_adjustment(age, weight_kg, heigh
     
     Validates: Requirements 2.3
     """
-    # Create profiles with different fitness goals
-    weight_loss_profile = UserProfile(
-        name="Test User",
-        age=age,
-        weight_kg=weight_kg,
-        height_cm=height_cm,
-        gender=gender,
-        fitness_goals=[FitnessGoal.WEIGHT_LOSS],
-    )
-    
-    muscle_gain_profile = UserProfile(
-        name="Test User",
-        age=age,
-        weight_kg=weight_kg,
-        height_cm=height_cm,
-        gender=gender,
-        fitness_goals=[FitnessGoal.MUSCLE_GAIN],
-    )
-    
-    maintenance_profile = UserProfile(
-        name="Test User",
-        age=age,
-        weight_kg=weight_kg,
-        height_cm=height_cm,
-        gender=gender,
-        fitness_goals=[FitnessGoal.MAINTENANCE],
-    )
+    # Macro ratios only depend on the goals, so one profile serves every goal
+    profile = UserProfile(name="Test User", **inputs)
     
-    endurance_profile = UserProfile(
-        name="Test User",
-        age=age,
-        weight_kg=weight_kg,
-        height_cm=height_cm,
-        gender=gender,
-        fitness_goals=[FitnessGoal.ENDURANCE],
-    )
+    def macros_for(goal):
+        profile.fitness_goals = [goal]
+        return profile.calculate_macro_ratios()
     
     # Get macro ratios for each goal
-    weight_loss_macros = weight_loss_profile.calculate_macro_ratios()
-    muscle_gain_macros = muscle_gain_profile.calculate_macro_ratios()
-    maintenance_macros = maintenance_profile.calculate_macro_ratios()
-    endurance_macros = endurance_profile.calculate_macro_ratios()
+    weight_loss_macros = macros_for(FitnessGoal.WEIGHT_LOSS)
+    muscle_gain_macros = macros_for(FitnessGoal.MUSCLE_GAIN)
+    maintenance_macros = macros_for(FitnessGoal.MAINTENANCE)
+    endurance_macros = macros_for(FitnessGoal.ENDURANCE)
     
     # Verify that ratios sum to approximately 1.0 (100%)
     for macros in [weight_loss_macros, muscle_gain_macros, maintenance_macros, endurance_macros]:
@@ -584,8 +582,8 @@ def test_property_4_fitness_goal_macro_nutrient_adjustment(age, weight_kg, heigh
     )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
-@given(profile=user_profiles())
+@settings(max_examples=50)
+@given(profile=user_profiles)
 def test_property_2_meal_plans_respect_dietary_preferences(profile):
     """Feature: nutrifit-ai-assistant, Property 2: Meal Plans Respect Dietary Preferences
     
@@ -594,20 +592,12 @@ def test_property_2_meal_plans_respect_dietary_preferences(profile):
     
     Validates: Requirements 1.4
     """
-    from nutrifit.engines.meal_planner import MealPlannerEngine
-    from nutrifit.data.recipes import get_sample_recipes
-    
-    # Ensure profile is valid
-    assume(profile.is_valid_structure())
-    
     # Only test if user has dietary preferences
     assume(len(profile.dietary_preferences) > 0)
     
-    # Get sample recipes
-    recipes = get_sample_recipes()
-    
     # Test the filtering logic directly instead of full plan generation
-    planner = MealPlannerEngine(recipes=recipes)
+    planner = _sample_meal_planner()
+    recipes = planner.recipes
     
     # Get dietary filters
     dietary_filters = [p.value for p in profile.dietary_preferences]
@@ -621,38 +611,20 @@ def test_property_2_meal_plans_respect_dietary_preferences(profile):
     
     # Check that all filtered recipes match dietary preferences
     for recipe in filtered_recipes:
-        # Check each dietary preference
+        tags = set(recipe.dietary_info)
         for pref in dietary_filters:
-            if pref == "vegetarian":
-                # Vegetarian accepts both vegetarian and vegan
-                assert any(d in ["vegetarian", "vegan"] for d in recipe.dietary_info), (
-                    f"Recipe '{recipe.name}' does not match vegetarian preference. "
-                    f"Dietary info: {recipe.dietary_info}"
-                )
-            elif pref == "vegan":
-                # Vegan requires strict vegan marking
-                assert "vegan" in recipe.dietary_info, (
-                    f"Recipe '{recipe.name}' does not match vegan preference. "
-                    f"Dietary info: {recipe.dietary_info}"
-                )
-            elif pref == "pescatarian":
-                # Pescatarian accepts pescatarian, vegetarian, and vegan
-                assert any(d in ["pescatarian", "vegetarian", "vegan"] for d in recipe.dietary_info), (
-                    f"Recipe '{recipe.name}' does not match pescatarian preference. "
-                    f"Dietary info: {recipe.dietary_info}"
-                )
-            else:
-                # Other preferences require exact match
-                assert pref in recipe.dietary_info, (
-                    f"Recipe '{recipe.name}' does not match {pref} preference. "
-                    f"Dietary info: {recipe.dietary_info}"
-                )
-
-
-
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
+            # Other preferences require an exact match
+            accepted = _DIET_ACCEPTED_TAGS.get(pref, frozenset({pref}))
+            assert not accepted.isdisjoint(tags), (
+                f"Recipe '{recipe.name}' does not match {pref} preference. "
+                f"Dietary info: {recipe.dietary_info}"
+            )
+
+
+
+@_EXPENSIVE
 @given(
-    pantry_items=st.lists(st.text(min_size=1, max_size=30).filter(lambda x: x.strip()), min_size=3, max_size=20),
+    pantry_items=st.lists(_NON_BLANK_30, min_size=3, max_size=20),
 )
 def test_property_7_pantry_ingredient_prioritization(pantry_items):
     """Feature: nutrifit-ai-assistant, Property 7: Pantry Ingredient Prioritization
@@ -662,8 +634,6 @@ def test_property_7_pantry_ingredient_prioritization(pantry_items):
     
     Validates: Requirements 3.2
     """
-    from nutrifit.engines.meal_planner import MealPlannerEngine
-    from nutrifit.models.recipe import Recipe, Ingredient, NutritionInfo
     
     # Create two test recipes with different pantry ingredient overlap
     # Recipe 1: Uses 3 pantry ingredients
@@ -711,21 +681,14 @@ def test_property_7_pantry_ingredient_prioritization(pantry_items):
         dietary_info=["vegetarian"],
     )
     
-    # Create planner with these recipes (use lightweight engines)
-    from nutrifit.engines.embedding_engine import EmbeddingEngine
-    from nutrifit.engines.llm_engine import LocalLLMEngine
+    # Pantry scoring does not depend on the planner's own recipe list, so the
+    # shared planner stands in for one built around these two recipes
+    planner = _sample_meal_planner()
     
-    embedding_engine = EmbeddingEngine()
-    llm_engine = LocalLLMEngine(use_fallback=True)
-    planner = MealPlannerEngine(
-        embedding_engine=embedding_engine,
-        llm_engine=llm_engine,
-        recipes=[recipe1, recipe2]
-    )
-    
-    # Score both recipes
-    score1 = planner._score_recipe_for_pantry(recipe1, pantry_items)
-    score2 = planner._score_recipe_for_pantry(recipe2, pantry_items)
+    # Normalize the pantry once, then score both recipes against it
+    pantry_lower = planner._normalize_pantry(pantry_items)
+    score1 = planner._score_against_pantry(recipe1, pantry_lower)
+    score2 = planner._score_against_pantry(recipe2, pantry_lower)
     
     # Recipe 1 should score higher because it uses more pantry ingredients
     # Recipe 1: 3/4 = 0.75
@@ -737,8 +700,8 @@ def test_property_7_pantry_ingredient_prioritization(pantry_items):
 
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
-@given(profile=user_profiles())
+@_EXPENSIVE
+@given(profile=user_profiles)
 def test_property_12_daily_caloric_target_adherence(profile):
     """Feature: nutrifit-ai-assistant, Property 12: Daily Caloric Target Adherence
     
@@ -747,34 +710,17 @@ def test_property_12_daily_caloric_target_adherence(profile):
     
     Validates: Requirements 5.4
     """
-    from nutrifit.engines.meal_planner import MealPlannerEngine
-    from nutrifit.data.recipes import get_sample_recipes
-    from nutrifit.engines.embedding_engine import EmbeddingEngine
-    from nutrifit.engines.llm_engine import LocalLLMEngine
-    
-    # Ensure profile is valid
-    assume(profile.is_valid_structure())
-    
     # Ensure user has a reasonable calorie target (at least 1000 calories)
-    # This is necessary because recipes have realistic calorie counts
-    assume(profile.daily_calorie_target is not None)
-    assume(profile.daily_calorie_target >= 1000)
-    assume(profile.daily_calorie_target <= 5000)
-    
-    # Get sample recipes and create planner with lightweight engines
-    recipes = get_sample_recipes()
-    # Use fallback mode to avoid loading heavy models
-    embedding_engine = EmbeddingEngine()
-    llm_engine = LocalLLMEngine(use_fallback=True)
-    planner = MealPlannerEngine(
-        embedding_engine=embedding_engine,
-        llm_engine=llm_engine,
-        recipes=recipes
-    )
+    # This is necessary because recipes have realistic calorie counts.
+    # __post_init__ always fills in the target, so it is never None here
+    assume(1000 <= profile.daily_calorie_target <= 5000)
+    
+    # Shared planner over the sample recipes
+    planner = _sample_meal_planner()
     
     # Generate a daily meal plan
     plan_date = date.today()
-    daily_plan = planner.generate_daily_plan(profile, plan_date)
+    daily_plan = _daily_plan(planner, profile, plan_date)
     
     # Get all recipes from the plan
     all_recipes = daily_plan.get_all_recipes()
@@ -797,8 +743,8 @@ def test_property_12_daily_caloric_target_adherence(profile):
 
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
-@given(profile=user_profiles())
+@settings(max_examples=50)
+@given(profile=user_profiles)
 def test_property_13_macro_nutrient_ratio_adherence(profile):
     """Feature: nutrifit-ai-assistant, Property 13: Macro-Nutrient Ratio Adherence
     
@@ -807,34 +753,18 @@ def test_property_13_macro_nutrient_ratio_adherence(profile):
     
     Validates: Requirements 5.5
     """
-    from nutrifit.engines.meal_planner import MealPlannerEngine
-    from nutrifit.data.recipes import get_sample_recipes
-    from nutrifit.engines.embedding_engine import EmbeddingEngine
-    from nutrifit.engines.llm_engine import LocalLLMEngine
-    
-    # Ensure profile is valid
-    assume(profile.is_valid_structure())
-    
     # Ensure user has fitness goals
     assume(len(profile.fitness_goals) > 0)
     
-    # Ensure user has a calorie target
-    assume(profile.daily_calorie_target is not None)
+    # Ensure user has a positive calorie target (__post_init__ always sets one)
     assume(profile.daily_calorie_target > 0)
     
-    # Get sample recipes and create planner with lightweight engines
-    recipes = get_sample_recipes()
-    embedding_engine = EmbeddingEngine()
-    llm_engine = LocalLLMEngine(use_fallback=True)
-    planner = MealPlannerEngine(
-        embedding_engine=embedding_engine,
-        llm_engine=llm_engine,
-        recipes=recipes
-    )
+    # Shared planner over the sample recipes
+    planner = _sample_meal_planner()
     
     # Generate a daily meal plan
     plan_date = date.today()
-    daily_plan = planner.generate_daily_plan(profile, plan_date)
+    daily_plan = _daily_plan(planner, profile, plan_date)
     
     # Get all recipes from the plan
     all_recipes = daily_plan.get_all_recipes()
@@ -842,26 +772,23 @@ def test_property_13_macro_nutrient_ratio_adherence(profile):
     # If no recipes were generated, skip this test case
     assume(len(all_recipes) > 0)
     
-    # Calculate total macros from the plan
-    total_protein = 0.0
-    total_carbs = 0.0
-    total_fat = 0.0
-    
-    for recipe in all_recipes:
-        total_protein += recipe.nutrition.protein_g
-        total_carbs += recipe.nutrition.carbs_g
-        total_fat += recipe.nutrition.fat_g
+    # Total macro grams from the plan as one (protein, carbs, fat) reduction
+    grams = np.array(
+        [(r.nutrition.protein_g, r.nutrition.carbs_g, r.nutrition.fat_g) for r in all_recipes],
+        dtype=np.float64,
+    )
     
     # Calculate actual calories from macros (protein=4, carbs=4, fat=9 cal/g)
-    calories_from_macros = (total_protein * 4) + (total_carbs * 4) + (total_fat * 9)
+    macro_calories = grams.sum(axis=0) * _CALORIES_PER_GRAM
+    calories_from_macros = macro_calories.sum()
     
     # Skip if no meaningful macros
     assume(calories_from_macros > 0)
     
     # Calculate actual ratios
-    actual_protein_ratio = (total_protein * 4) / calories_from_macros
-    actual_carbs_ratio = (total_carbs * 4) / calories_from_macros
-    actual_fat_ratio = (total_fat * 9) / calories_from_macros
+    actual_protein_ratio, actual_carbs_ratio, actual_fat_ratio = (
+        macro_calories / calories_from_macros
+    )
     
     # Get target ratios from user profile
     target_ratios = profile.calculate_macro_ratios()
@@ -907,8 +834,8 @@ def test_property_13_macro_nutrient_ratio_adherence(profile):
     )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
-@given(profile=user_profiles())
+@settings(max_examples=50)
+@given(profile=user_profiles)
 def test_property_5_meal_plans_align_with_fitness_goals(profile):
     """Feature: nutrifit-ai-assistant, Property 5: Meal Plans Align with Fitness Goals
     
@@ -917,28 +844,15 @@ def test_property_5_meal_plans_align_with_fitness_goals(profile):
     
     Validates: Requirements 2.4
     """
-    from nutrifit.engines.meal_planner import MealPlannerEngine
-    from nutrifit.data.recipes import get_sample_recipes
-    from nutrifit.engines.embedding_engine import EmbeddingEngine
-    from nutrifit.engines.llm_engine import LocalLLMEngine
-    
-    # Ensure profile is valid and has fitness goals
-    assume(profile.is_valid_structure())
+    # Ensure profile has fitness goals
     assume(len(profile.fitness_goals) > 0)
     
-    # Get sample recipes and create planner
-    recipes = get_sample_recipes()
-    embedding_engine = EmbeddingEngine()
-    llm_engine = LocalLLMEngine(use_fallback=True)
-    planner = MealPlannerEngine(
-        embedding_engine=embedding_engine,
-        llm_engine=llm_engine,
-        recipes=recipes
-    )
+    # Shared planner over the sample recipes
+    planner = _sample_meal_planner()
     
     # Generate a daily meal plan
     plan_date = date.today()
-    daily_plan = planner.generate_daily_plan(profile, plan_date)
+    daily_plan = _daily_plan(planner, profile, plan_date)
     
     # Get all recipes from the plan
     all_recipes = daily_plan.get_all_recipes()
@@ -946,12 +860,11 @@ def test_property_5_meal_plans_align_with_fitness_goals(profile):
     # If no recipes were generated, skip this test case
     assume(len(all_recipes) > 0)
     
-    # Calculate total macros
-    total_protein = sum(r.nutrition.protein_g for r in all_recipes)
-    total_calories = daily_plan.total_calories
-    
     # For muscle gain goals, protein should be higher
     if FitnessGoal.MUSCLE_GAIN in profile.fitness_goals:
+        # The plan's own total, summed only when the goal needs it
+        total_protein = daily_plan.total_protein
+        
         # Protein should be at least 1.6g per kg body weight (minimum for muscle gain)
         min_protein_g = profile.weight_kg * 1.6
         assert total_protein >= min_protein_g * 0.8, (
@@ -967,11 +880,13 @@ def test_property_5_meal_plans_align_with_fitness_goals(profile):
         )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
+@_STRUCTURAL
 @given(
     start_date=st.dates(min_value=date(2020, 1, 1), max_value=date(2030, 12, 31)),
     duration_days=st.integers(min_value=1, max_value=14),
 )
+@example(start_date=date(2020, 1, 1), duration_days=1)
+@example(start_date=date(2030, 12, 31), duration_days=14)
 def test_property_11_meal_plan_duration_correctness(start_date, duration_days):
     """Feature: nutrifit-ai-assistant, Property 11: Meal Plan Duration Correctness
     
@@ -980,11 +895,6 @@ def test_property_11_meal_plan_duration_correctness(start_date, duration_days):
     
     Validates: Requirements 5.1
     """
-    from nutrifit.engines.meal_planner import MealPlannerEngine
-    from nutrifit.data.recipes import get_sample_recipes
-    from nutrifit.engines.embedding_engine import EmbeddingEngine
-    from nutrifit.engines.llm_engine import LocalLLMEngine
-    from nutrifit.models.user import UserProfile, FitnessGoal
     
     # Create a simple user profile
     profile = UserProfile(
@@ -995,28 +905,21 @@ def test_property_11_meal_plan_duration_correctness(start_date, duration_days):
         fitness_goals=[FitnessGoal.MAINTENANCE],
     )
     
-    # Get sample recipes and create planner
-    recipes = get_sample_recipes()
-    embedding_engine = EmbeddingEngine()
-    llm_engine = LocalLLMEngine(use_fallback=True)
-    planner = MealPlannerEngine(
-        embedding_engine=embedding_engine,
-        llm_engine=llm_engine,
-        recipes=recipes
-    )
+    # Shared planner over the sample recipes
+    planner = _sample_meal_planner()
     
     # Generate plan for specified duration
     end_date = start_date + timedelta(days=duration_days - 1)
     
-    # Generate daily plans for each day
-    daily_plans = []
-    for day_offset in range(duration_days):
-        plan_date = start_date + timedelta(days=day_offset)
-        daily_plan = planner.generate_daily_plan(profile, plan_date)
-        daily_plans.append(daily_plan)
+    # Plan one day, then re-stamp it for each day of the duration; the
+    # property concerns the day count, not what each day contains
+    base_plan = _daily_plan(planner, profile, start_date)
+    daily_plans = [
+        replace(base_plan, date=start_date + timedelta(days=day_offset))
+        for day_offset in range(duration_days)
+    ]
     
     # Create meal plan
-    from nutrifit.models.plan import MealPlan
     meal_plan = MealPlan(
         id="test_plan",
         name="Test Plan",
@@ -1034,8 +937,8 @@ def test_property_11_meal_plan_duration_correctness(start_date, duration_days):
     )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
-@given(profile=user_profiles())
+@settings(max_examples=50)
+@given(profile=user_profiles)
 def test_property_10_equipment_compatibility_in_workout_plans(profile):
     """Feature: nutrifit-ai-assistant, Property 10: Equipment Compatibility in Workout Plans
     
@@ -1044,36 +947,20 @@ def test_property_10_equipment_compatibility_in_workout_plans(profile):
     
     Validates: Requirements 4.4
     """
-    from nutrifit.engines.workout_planner import WorkoutPlannerEngine
-    from nutrifit.data.workouts import get_sample_workouts
-    from nutrifit.engines.embedding_engine import EmbeddingEngine
-    from nutrifit.engines.llm_engine import LocalLLMEngine
-    
-    # Ensure profile is valid
-    assume(profile.is_valid_structure())
-    
-    # Get sample workouts and create planner
-    workouts = get_sample_workouts()
-    embedding_engine = EmbeddingEngine()
-    llm_engine = LocalLLMEngine(use_fallback=True)
-    planner = WorkoutPlannerEngine(
-        embedding_engine=embedding_engine,
-        llm_engine=llm_engine,
-        workouts=workouts
-    )
+    # Shared planner over the sample workouts
+    planner = _sample_workout_planner()
     
     # Generate a daily workout plan
     plan_date = date.today()
-    daily_plan = planner.generate_daily_plan(profile, plan_date, day_number=0)
+    daily_plan = _daily_plan(planner, profile, plan_date)
     
     # If it's a rest day, skip
     if daily_plan.is_rest_day:
         return
     
-    # Get available equipment (normalized to lowercase)
-    available_equipment_lower = [e.lower() for e in profile.available_equipment]
-    # Always include bodyweight as available
-    available_equipment_lower.extend(["bodyweight", "none"])
+    # Available equipment (normalized to lowercase) as a set for O(1) lookups;
+    # bodyweight is always available
+    available_equipment_lower = _available_equipment(profile)
     
     # Check each workout
     for workout in daily_plan.workouts:
@@ -1085,11 +972,13 @@ def test_property_10_equipment_compatibility_in_workout_plans(profile):
             )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
+@_STRUCTURAL
 @given(
     start_date=st.dates(min_value=date(2020, 1, 1), max_value=date(2030, 12, 31)),
     workout_days=st.integers(min_value=1, max_value=7),
 )
+@example(start_date=date(2020, 1, 1), workout_days=1)
+@example(start_date=date(2030, 12, 31), workout_days=7)
 def test_property_14_workout_plan_duration_correctness(start_date, workout_days):
     """Feature: nutrifit-ai-assistant, Property 14: Workout Plan Duration Correctness
     
@@ -1097,11 +986,6 @@ def test_property_14_workout_plan_duration_correctness(start_date, workout_days)
     
     Validates: Requirements 6.1
     """
-    from nutrifit.engines.workout_planner import WorkoutPlannerEngine
-    from nutrifit.data.workouts import get_sample_workouts
-    from nutrifit.engines.embedding_engine import EmbeddingEngine
-    from nutrifit.engines.llm_engine import LocalLLMEngine
-    from nutrifit.models.user import UserProfile, FitnessGoal
     
     # Create a simple user profile
     profile = UserProfile(
@@ -1112,15 +996,8 @@ def test_property_14_workout_plan_duration_correctness(start_date, workout_days)
         fitness_goals=[FitnessGoal.MAINTENANCE],
     )
     
-    # Get sample workouts and create planner
-    workouts = get_sample_workouts()
-    embedding_engine = EmbeddingEngine()
-    llm_engine = LocalLLMEngine(use_fallback=True)
-    planner = WorkoutPlannerEngine(
-        embedding_engine=embedding_engine,
-        llm_engine=llm_engine,
-        workouts=workouts
-    )
+    # Shared planner over the sample workouts
+    planner = _sample_workout_planner()
     
     # Generate weekly plan
     workout_plan = planner.generate_weekly_plan(
@@ -1136,8 +1013,8 @@ def test_property_14_workout_plan_duration_correctness(start_date, workout_days)
     )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
-@given(profile=user_profiles())
+@settings(max_examples=50)
+@given(profile=user_profiles)
 def test_property_15_exercise_fitness_level_and_equipment_match(profile):
     """Feature: nutrifit-ai-assistant, Property 15: Exercise Fitness Level and Equipment Match
     
@@ -1146,35 +1023,19 @@ def test_property_15_exercise_fitness_level_and_equipment_match(profile):
     
     Validates: Requirements 6.3
     """
-    from nutrifit.engines.workout_planner import WorkoutPlannerEngine
-    from nutrifit.data.workouts import get_sample_workouts
-    from nutrifit.engines.embedding_engine import EmbeddingEngine
-    from nutrifit.engines.llm_engine import LocalLLMEngine
-    
-    # Ensure profile is valid
-    assume(profile.is_valid_structure())
-    
-    # Get sample workouts and create planner
-    workouts = get_sample_workouts()
-    embedding_engine = EmbeddingEngine()
-    llm_engine = LocalLLMEngine(use_fallback=True)
-    planner = WorkoutPlannerEngine(
-        embedding_engine=embedding_engine,
-        llm_engine=llm_engine,
-        workouts=workouts
-    )
+    # Shared planner over the sample workouts
+    planner = _sample_workout_planner()
     
     # Generate a daily workout plan
     plan_date = date.today()
-    daily_plan = planner.generate_daily_plan(profile, plan_date, day_number=0)
+    daily_plan = _daily_plan(planner, profile, plan_date)
     
     # If it's a rest day, skip
     if daily_plan.is_rest_day:
         return
     
-    # Get available equipment (normalized)
-    available_equipment_lower = [e.lower() for e in profile.available_equipment]
-    available_equipment_lower.extend(["bodyweight", "none"])
+    # Available equipment (normalized) as a set for O(1) lookups
+    available_equipment_lower = _available_equipment(profile)
     
     # Check each workout and exercise
     for workout in daily_plan.workouts:
@@ -1192,8 +1053,8 @@ def test_property_15_exercise_fitness_level_and_equipment_match(profile):
         )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
-@given(profile=user_profiles())
+@settings(max_examples=50)
+@given(profile=user_profiles)
 def test_property_16_exercise_completeness(profile):
     """Feature: nutrifit-ai-assistant, Property 16: Exercise Completeness
     
@@ -1202,27 +1063,12 @@ def test_property_16_exercise_completeness(profile):
     
     Validates: Requirements 6.4
     """
-    from nutrifit.engines.workout_planner import WorkoutPlannerEngine
-    from nutrifit.data.workouts import get_sample_workouts
-    from nutrifit.engines.embedding_engine import EmbeddingEngine
-    from nutrifit.engines.llm_engine import LocalLLMEngine
-    
-    # Ensure profile is valid
-    assume(profile.is_valid_structure())
-    
-    # Get sample workouts and create planner
-    workouts = get_sample_workouts()
-    embedding_engine = EmbeddingEngine()
-    llm_engine = LocalLLMEngine(use_fallback=True)
-    planner = WorkoutPlannerEngine(
-        embedding_engine=embedding_engine,
-        llm_engine=llm_engine,
-        workouts=workouts
-    )
+    # Shared planner over the sample workouts
+    planner = _sample_workout_planner()
     
     # Generate a daily workout plan
     plan_date = date.today()
-    daily_plan = planner.generate_daily_plan(profile, plan_date, day_number=0)
+    daily_plan = _daily_plan(planner, profile, plan_date)
     
     # If it's a rest day, skip
     if daily_plan.is_rest_day:
@@ -1246,8 +1092,8 @@ def test_property_16_exercise_completeness(profile):
             )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
-@given(profile=user_profiles())
+@settings(max_examples=50)
+@given(profile=user_profiles)
 def test_property_17_workout_intensity_balance(profile):
     """Feature: nutrifit-ai-assistant, Property 17: Workout Intensity Balance
     
@@ -1255,23 +1101,8 @@ def test_property_17_workout_intensity_balance(profile):
     
     Validates: Requirements 6.5
     """
-    from nutrifit.engines.workout_planner import WorkoutPlannerEngine
-    from nutrifit.data.workouts import get_sample_workouts
-    from nutrifit.engines.embedding_engine import EmbeddingEngine
-    from nutrifit.engines.llm_engine import LocalLLMEngine
-    
-    # Ensure profile is valid
-    assume(profile.is_valid_structure())
-    
-    # Get sample workouts and create planner
-    workouts = get_sample_workouts()
-    embedding_engine = EmbeddingEngine()
-    llm_engine = LocalLLMEngine(use_fallback=True)
-    planner = WorkoutPlannerEngine(
-        embedding_engine=embedding_engine,
-        llm_engine=llm_engine,
-        workouts=workouts
-    )
+    # Shared planner over the sample workouts
+    planner = _sample_workout_planner()
     
     # Generate weekly plan
     workout_plan = planner.generate_weekly_plan(profile)
@@ -1280,37 +1111,31 @@ def test_property_17_workout_intensity_balance(profile):
     # High intensity is defined as HIIT or very long workouts (>60 min)
     high_intensity_types = ["hiit"]
     
-    for i in range(len(workout_plan.daily_plans) - 1):
-        day1 = workout_plan.daily_plans[i]
-        day2 = workout_plan.daily_plans[i + 1]
-        
-        if day1.is_rest_day or day2.is_rest_day:
-            continue
-        
-        day1_high_intensity = any(
-            w.workout_type in high_intensity_types or w.total_duration_minutes > 60
-            for w in day1.workouts
-        )
-        day2_high_intensity = any(
+    # Classify each day once; rest days are never high intensity
+    days = workout_plan.daily_plans
+    high_intensity = [
+        not day.is_rest_day
+        and any(
             w.workout_type in high_intensity_types or w.total_duration_minutes > 60
-            for w in day2.workouts
+            for w in day.workouts
         )
-        
+        for day in days
+    ]
+    durations = [sum(w.total_duration_minutes for w in day.workouts) for day in days]
+    
+    for i in range(len(days) - 1):
         # Allow some flexibility - this is a soft constraint
         # The planner should try to avoid consecutive high-intensity days
         # but it's acceptable if necessary for the plan structure
-        if day1_high_intensity and day2_high_intensity:
-            # At least one should be moderate intensity
-            day1_total_duration = sum(w.total_duration_minutes for w in day1.workouts)
-            day2_total_duration = sum(w.total_duration_minutes for w in day2.workouts)
+        if high_intensity[i] and high_intensity[i + 1]:
             # If both are high intensity, at least one should be shorter
-            assert day1_total_duration < 90 or day2_total_duration < 90, (
-                f"Consecutive high-intensity days detected on {day1.date} and {day2.date}"
+            assert durations[i] < 90 or durations[i + 1] < 90, (
+                f"Consecutive high-intensity days detected on {days[i].date} and {days[i + 1].date}"
             )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
-@given(profile=user_profiles())
+@settings(max_examples=50)
+@given(profile=user_profiles)
 def test_property_18_shopping_list_ingredient_completeness(profile):
     """Feature: nutrifit-ai-assistant, Property 18: Shopping List Ingredient Completeness
     
@@ -1319,24 +1144,9 @@ def test_property_18_shopping_list_ingredient_completeness(profile):
     
     Validates: Requirements 7.1
     """
-    from nutrifit.engines.meal_planner import MealPlannerEngine
-    from nutrifit.data.recipes import get_sample_recipes
-    from nutrifit.engines.embedding_engine import EmbeddingEngine
-    from nutrifit.engines.llm_engine import LocalLLMEngine
-    from nutrifit.utils.shopping_list import ShoppingListOptimizer
-    
-    # Ensure profile is valid
-    assume(profile.is_valid_structure())
-    
-    # Get sample recipes and create planner
-    recipes = get_sample_recipes()
-    embedding_engine = EmbeddingEngine()
-    llm_engine = LocalLLMEngine(use_fallback=True)
-    planner = MealPlannerEngine(
-        embedding_engine=embedding_engine,
-        llm_engine=llm_engine,
-        recipes=recipes
-    )
+    
+    # Shared planner over the sample recipes
+    planner = _sample_meal_planner()
     
     # Generate a weekly meal plan
     meal_plan = planner.generate_weekly_plan(profile)
@@ -1350,33 +1160,28 @@ def test_property_18_shopping_list_ingredient_completeness(profile):
     shopping_list = optimizer.generate_from_meal_plan(meal_plan, pantry_items=profile.pantry_items)
     
     # Collect all ingredient names from recipes (excluding pantry items)
-    required_ingredients = set()
     pantry_lower = [p.lower() for p in profile.pantry_items]
-    
-    for recipe in all_recipes:
-        for ingredient in recipe.ingredients:
-            ingredient_lower = ingredient.name.lower()
-            # Check if ingredient is in pantry
-            in_pantry = any(
-                pantry_item in ingredient_lower or ingredient_lower in pantry_item
-                for pantry_item in pantry_lower
-            )
-            if not in_pantry:
-                required_ingredients.add(ingredient.name.lower())
+    pantry_index = _name_index(pantry_lower)
+    required_ingredients = {
+        ingredient.name.lower()
+        for recipe in all_recipes
+        for ingredient in recipe.ingredients
+    }
+    required_ingredients = {
+        name for name in required_ingredients if not _overlaps(name, pantry_lower, pantry_index)
+    }
     
     # Check that all required ingredients are in shopping list
     shopping_list_ingredients = {item.name.lower() for item in shopping_list.items}
+    shopping_index = _name_index(shopping_list_ingredients)
     
-    # Allow for some flexibility in ingredient name matching
-    missing_ingredients = []
-    for req_ing in required_ingredients:
-        found = False
-        for shop_ing in shopping_list_ingredients:
-            if req_ing in shop_ing or shop_ing in req_ing:
-                found = True
-                break
-        if not found:
-            missing_ingredients.append(req_ing)
+    # Exact names clear in one set difference; only the rest need the more
+    # flexible substring match
+    missing_ingredients = [
+        req_ing
+        for req_ing in required_ingredients - shopping_list_ingredients
+        if not _overlaps(req_ing, shopping_list_ingredients, shopping_index)
+    ]
     
     # Most ingredients should be present (allow for some edge cases)
     assert len(missing_ingredients) <= len(required_ingredients) * 0.1, (
@@ -1384,9 +1189,9 @@ def test_property_18_shopping_list_ingredient_completeness(profile):
     )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
+@settings(max_examples=50)
 @given(
-    pantry_items=st.lists(st.text(min_size=1, max_size=30).filter(lambda x: x.strip()), min_size=1, max_size=10),
+    pantry_items=st.lists(_NON_BLANK_30, min_size=1, max_size=10),
 )
 def test_property_19_shopping_list_pantry_exclusion(pantry_items):
     """Feature: nutrifit-ai-assistant, Property 19: Shopping List Pantry Exclusion
@@ -1396,12 +1201,6 @@ def test_property_19_shopping_list_pantry_exclusion(pantry_items):
     
     Validates: Requirements 7.2
     """
-    from nutrifit.engines.meal_planner import MealPlannerEngine
-    from nutrifit.data.recipes import get_sample_recipes
-    from nutrifit.engines.embedding_engine import EmbeddingEngine
-    from nutrifit.engines.llm_engine import LocalLLMEngine
-    from nutrifit.utils.shopping_list import ShoppingListOptimizer
-    from nutrifit.models.user import UserProfile, FitnessGoal
     
     # Create a user profile with pantry items
     profile = UserProfile(
@@ -1413,15 +1212,8 @@ def test_property_19_shopping_list_pantry_exclusion(pantry_items):
         pantry_items=pantry_items,
     )
     
-    # Get sample recipes and create planner
-    recipes = get_sample_recipes()
-    embedding_engine = EmbeddingEngine()
-    llm_engine = LocalLLMEngine(use_fallback=True)
-    planner = MealPlannerEngine(
-        embedding_engine=embedding_engine,
-        llm_engine=llm_engine,
-        recipes=recipes
-    )
+    # Shared planner over the sample recipes
+    planner = _sample_meal_planner()
     
     # Generate a weekly meal plan
     meal_plan = planner.generate_weekly_plan(profile)
@@ -1434,16 +1226,22 @@ def test_property_19_shopping_list_pantry_exclusion(pantry_items):
     pantry_lower = [p.lower() for p in pantry_items]
     shopping_list_names = [item.name.lower() for item in shopping_list.items]
     
+    # No substring match in either direction: one scan per name over the
+    # other side's joined index covers every (pantry, shopping) pair
+    shopping_index = _name_index(shopping_list_names)
+    pantry_index = _name_index(pantry_lower)
     for pantry_item in pantry_lower:
-        for shop_item in shopping_list_names:
-            # Check for substring matches (pantry item should not be in shopping list)
-            assert pantry_item not in shop_item and shop_item not in pantry_item, (
-                f"Pantry item '{pantry_item}' found in shopping list as '{shop_item}'"
-            )
+        assert pantry_item not in shopping_index, (
+            f"Pantry item '{pantry_item}' found in shopping list {shopping_list_names}"
+        )
+    for shop_item in shopping_list_names:
+        assert shop_item not in pantry_index, (
+            f"Shopping list item '{shop_item}' matches pantry items {pantry_lower}"
+        )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
-@given(profile=user_profiles())
+@_STRUCTURAL
+@given(profile=user_profiles)
 def test_property_20_shopping_list_ingredient_consolidation(profile):
     """Feature: nutrifit-ai-assistant, Property 20: Shopping List Ingredient Consolidation
     
@@ -1452,24 +1250,9 @@ def test_property_20_shopping_list_ingredient_consolidation(profile):
     
     Validates: Requirements 7.3
     """
-    from nutrifit.engines.meal_planner import MealPlannerEngine
-    from nutrifit.data.recipes import get_sample_recipes
-    from nutrifit.engines.embedding_engine import EmbeddingEngine
-    from nutrifit.engines.llm_engine import LocalLLMEngine
-    from nutrifit.utils.shopping_list import ShoppingListOptimizer
-    
-    # Ensure profile is valid
-    assume(profile.is_valid_structure())
-    
-    # Get sample recipes and create planner
-    recipes = get_sample_recipes()
-    embedding_engine = EmbeddingEngine()
-    llm_engine = LocalLLMEngine(use_fallback=True)
-    planner = MealPlannerEngine(
-        embedding_engine=embedding_engine,
-        llm_engine=llm_engine,
-        recipes=recipes
-    )
+    
+    # Shared planner over the sample recipes
+    planner = _sample_meal_planner()
     
     # Generate a weekly meal plan
     meal_plan = planner.generate_weekly_plan(profile)
@@ -1479,23 +1262,17 @@ def test_property_20_shopping_list_ingredient_consolidation(profile):
     shopping_list = optimizer.generate_from_meal_plan(meal_plan, pantry_items=profile.pantry_items)
     
     # Check that ingredients with the same name and unit are consolidated
-    ingredient_groups = {}
-    for item in shopping_list.items:
-        key = (item.name.lower(), item.unit.lower())
-        if key not in ingredient_groups:
-            ingredient_groups[key] = []
-        ingredient_groups[key].append(item)
-    
-    # Each group should have only one item (consolidated)
-    for key, items in ingredient_groups.items():
-        assert len(items) == 1, (
-            f"Ingredient '{key[0]}' with unit '{key[1]}' appears {len(items)} times "
-            f"but should be consolidated into one item"
-        )
+    counts = Counter((item.name.lower(), item.unit.lower()) for item in shopping_list.items)
+    
+    # Each (name, unit) should appear only once (consolidated)
+    duplicates = {key: count for key, count in counts.items() if count > 1}
+    assert not duplicates, (
+        f"Ingredients appear more than once but should be consolidated: {duplicates}"
+    )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
-@given(profile=user_profiles())
+@_STRUCTURAL
+@given(profile=user_profiles)
 def test_property_21_shopping_list_categorization(profile):
     """Feature: nutrifit-ai-assistant, Property 21: Shopping List Categorization
     
@@ -1503,24 +1280,9 @@ def test_property_21_shopping_list_categorization(profile):
     
     Validates: Requirements 7.4
     """
-    from nutrifit.engines.meal_planner import MealPlannerEngine
-    from nutrifit.data.recipes import get_sample_recipes
-    from nutrifit.engines.embedding_engine import EmbeddingEngine
-    from nutrifit.engines.llm_engine import LocalLLMEngine
-    from nutrifit.utils.shopping_list import ShoppingListOptimizer
-    
-    # Ensure profile is valid
-    assume(profile.is_valid_structure())
-    
-    # Get sample recipes and create planner
-    recipes = get_sample_recipes()
-    embedding_engine = EmbeddingEngine()
-    llm_engine = LocalLLMEngine(use_fallback=True)
-    planner = MealPlannerEngine(
-        embedding_engine=embedding_engine,
-        llm_engine=llm_engine,
-        recipes=recipes
-    )
+    
+    # Shared planner over the sample recipes
+    planner = _sample_meal_planner()
     
     # Generate a weekly meal plan
     meal_plan = planner.generate_weekly_plan(profile)
@@ -1539,8 +1301,8 @@ def test_property_21_shopping_list_categorization(profile):
         )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
-@given(entry=progress_entries())
+@settings(max_examples=25)
+@given(entry=progress_entries)
 def test_property_22_meal_completion_recording(entry):
     """Feature: nutrifit-ai-assistant, Property 22: Meal Completion Recording
     
@@ -1549,7 +1311,6 @@ def test_property_22_meal_completion_recording(entry):
     
     Validates: Requirements 8.1
     """
-    from nutrifit.models.progress import ProgressTracker
     
     # Create a tracker
     tracker = ProgressTracker(user_id="test_user")
@@ -1567,8 +1328,8 @@ def test_property_22_meal_completion_recording(entry):
     )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
-@given(entry=progress_entries())
+@settings(max_examples=25)
+@given(entry=progress_entries)
 def test_property_23_workout_completion_recording(entry):
     """Feature: nutrifit-ai-assistant, Property 23: Workout Completion Recording
     
@@ -1577,7 +1338,6 @@ def test_property_23_workout_completion_recording(entry):
     
     Validates: Requirements 8.2
     """
-    from nutrifit.models.progress import ProgressTracker
     
     # Create a tracker
     tracker = ProgressTracker(user_id="test_user")
@@ -1595,7 +1355,7 @@ def test_property_23_workout_completion_recording(entry):
     )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
+@settings(max_examples=50)
 @given(
     num_entries=st.integers(min_value=7, max_value=14),
 )
@@ -1607,29 +1367,20 @@ def test_property_24_weekly_progress_aggregation(num_entries):
     
     Validates: Requirements 8.3
     """
-    from nutrifit.models.progress import ProgressTracker, ProgressEntry
     
     # Create a tracker
     tracker = ProgressTracker(user_id="test_user")
     
     # Add entries for the past week
     base_date = date.today()
-    total_calories = 0
-    total_workouts = 0
-    
-    for i in range(num_entries):
-        entry_date = base_date - timedelta(days=num_entries - i - 1)
-        calories = 2000 + (i * 100)
-        workouts = 1 if i % 2 == 0 else 0
-        
-        entry = ProgressEntry(
-            date=entry_date,
-            calories_consumed=calories,
-            workouts_completed=workouts,
+    tracker.add_entries(
+        ProgressEntry(
+            date=base_date - timedelta(days=num_entries - i - 1),
+            calories_consumed=2000 + (i * 100),
+            workouts_completed=1 if i % 2 == 0 else 0,
         )
-        tracker.add_entry(entry)
-        total_calories += calories
-        total_workouts += workouts
+        for i in range(num_entries)
+    )
     
     # Get weekly summary
     summary = tracker.get_summary()
@@ -1651,14 +1402,16 @@ def test_property_24_weekly_progress_aggregation(num_entries):
     )
 
 
-@settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow], database=None, deadline=None)
-@given(
-    planned_meals=st.integers(min_value=1, max_value=21),
-    completed_meals=st.integers(min_value=0, max_value=21),
-    planned_workouts=st.integers(min_value=1, max_value=7),
-    completed_workouts=st.integers(min_value=0, max_value=7),
-)
-def test_property_25_adherence_percentage_calculation(planned_meals, completed_meals, planned_workouts, completed_workouts):
+def _planned_and_completed(max_planned):
+    """Draw (planned, completed) counts with 1 <= planned <= max_planned and completed <= planned."""
+    return st.integers(min_value=1, max_value=max_planned).flatmap(
+        lambda planned: st.tuples(st.just(planned), st.integers(min_value=0, max_value=planned))
+    )
+
+
+@settings(max_examples=25)
+@given(meal_counts=_planned_and_completed(21), workout_counts=_planned_and_completed(7))
+def test_property_25_adherence_percentage_calculation(meal_counts, workout_counts):
     """Feature: nutrifit-ai-assistant, Property 25: Adherence Percentage Calculation
     
     For any progress data, the adherence percentage should be calculated correctly 
@@ -1666,11 +1419,8 @@ def test_property_25_adherence_percentage_calculation(planned_meals, completed_m
     
     Validates: Requirements 8.4
     """
-    from nutrifit.models.progress import ProgressTracker, ProgressEntry
-    
-    # Ensure completed doesn't exceed planned
-    assume(completed_meals <= planned_meals)
-    assume(completed_workouts <= planned_workouts)
+    planned_meals, completed_meals = meal_counts
+    planned_workouts, completed_workouts = workout_counts
     
     # Create a tracker
     tracker = ProgressTracker(user_id="test_user")
@@ -1679,13 +1429,13 @@ def test_property_25_adherence_percentage_calculation(planned_meals, completed_m
     base_date = date.today()
     for i in range(7):
         entry_date = base_date - timedelta(days=6 - i)
-        meals = completed_meals // 7 + (1 if i < (completed_meals % 7) else 0)
-        workouts = completed_workouts // 7 + (1 if i < (completed_workouts % 7) else 0)
+        day_meals = completed_meals // 7 + (1 if i < (completed_meals % 7) else 0)
+        day_workouts = completed_workouts // 7 + (1 if i < (completed_workouts % 7) else 0)
         
         entry = ProgressEntry(
             date=entry_date,
-            meals_followed=meals,
-            workouts_completed=workouts,
+            meals_followed=day_meals,
+            workouts_completed=day_workouts,
         )
         tracker.add_entry(entry)
     
@@ -1,16 +1,23 @@
 """Tests for NutriFit utilities."""
 
-import tempfile
-from datetime import date
-from pathlib import Path
+import os
+import sys
+from datetime import date, timedelta
 
 import pytest
 
+from nutrifit.models.plan import MealPlan
 from nutrifit.models.progress import ProgressEntry
 from nutrifit.models.recipe import Ingredient, NutritionInfo, Recipe
 from nutrifit.models.user import DietaryPreference, UserProfile
 from nutrifit.utils.shopping_list import ShoppingListOptimizer
-from nutrifit.utils.storage import DataStorage
+from nutrifit.utils.storage import (
+    CorruptedDataError,
+    DataStorage,
+    PermissionError as StoragePermissionError,
+    StorageManager,
+    ValidationError,
+)
 
 
 class TestShoppingListOptimizer:
@@ -101,11 +108,9 @@ class TestDataStorage:
     """Tests for DataStorage."""
 
     @pytest.fixture
-    def temp_storage(self):
-        """Create temporary storage for testing."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            storage = DataStorage(data_dir=Path(tmpdir))
-            yield storage
+    def temp_storage(self, tmp_path_factory):
+        """Create storage in a fresh directory under the session's tmp root."""
+        return DataStorage(data_dir=tmp_path_factory.mktemp("storage"))
 
     def test_save_and_load_user_profile(self, temp_storage):
         """Test saving and loading user profile."""
@@ -159,6 +164,19 @@ class TestDataStorage:
         assert len(tracker.entries) == 1
         assert tracker.entries[0].weight_kg == 70.0
 
+    def test_add_progress_entries(self, temp_storage):
+        """Test adding several progress entries in one save."""
+        today = date.today()
+        entries = [
+            ProgressEntry(date=today, weight_kg=70.0),
+            ProgressEntry(date=today - timedelta(days=1), weight_kg=70.5),
+        ]
+        temp_storage.add_progress_entries(entries, "test_user")
+
+        tracker = temp_storage.load_progress_tracker("test_user")
+        assert tracker is not None
+        assert [e.weight_kg for e in tracker.entries] == [70.5, 70.0]
+
     def test_get_progress_summary(self, temp_storage):
         """Test getting progress summary."""
         entry = ProgressEntry(
@@ -206,12 +224,9 @@ class TestStorageErrorHandling:
     """
 
     @pytest.fixture
-    def temp_storage(self):
-        """Create temporary storage for testing."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            from nutrifit.utils.storage import StorageManager
-            storage = StorageManager(data_dir=Path(tmpdir))
-            yield storage
+    def temp_storage(self, tmp_path_factory):
+        """Create storage in a fresh directory under the session's tmp root."""
+        return StorageManager(data_dir=tmp_path_factory.mktemp("storage_errors"))
 
     def test_file_not_found_scenario(self, temp_storage):
         """Test handling of file not found scenarios."""
@@ -233,8 +248,6 @@ class TestStorageErrorHandling:
 
     def test_corrupted_data_handling(self, temp_storage):
         """Test handling of corrupted data files."""
-        from nutrifit.utils.storage import CorruptedDataError
-        
         # Create a corrupted JSON file
         corrupted_file = temp_storage.data_dir / "users" / "corrupted.json"
         with open(corrupted_file, "w") as f:
@@ -246,8 +259,6 @@ class TestStorageErrorHandling:
 
     def test_validation_error_on_save(self, temp_storage):
         """Test that invalid data is rejected before persistence."""
-        from nutrifit.utils.storage import ValidationError
-        
         # Create a user profile and then manually invalidate it
         # (bypassing __post_init__ validation)
         profile = UserProfile(
@@ -268,10 +279,6 @@ class TestStorageErrorHandling:
 
     def test_permission_error_handling(self, temp_storage):
         """Test handling of permission errors."""
-        from nutrifit.utils.storage import PermissionError as StoragePermissionError
-        import os
-        import sys
-        
         # Skip this test on Windows as permission handling is different
         if sys.platform == "win32":
             pytest.skip("Permission test not applicable on Windows")
@@ -285,7 +292,6 @@ class TestStorageErrorHandling:
             os.chmod(readonly_dir, 0o444)
             
             # Try to create a subdirectory (should fail)
-            from nutrifit.utils.storage import StorageManager
             with pytest.raises(StoragePermissionError):
                 StorageManager(data_dir=readonly_dir / "subdir")
         finally:
@@ -294,8 +300,6 @@ class TestStorageErrorHandling:
 
     def test_corrupted_meal_plan_in_list(self, temp_storage):
         """Test that corrupted meal plans are skipped when listing."""
-        from nutrifit.models.plan import MealPlan, DailyMealPlan
-        
         # Save a valid meal plan
         valid_plan = MealPlan(
             id="valid_plan",
@@ -318,8 +322,6 @@ class TestStorageErrorHandling:
 
     def test_invalid_progress_entry_rejected(self, temp_storage):
         """Test that invalid progress entries are rejected."""
-        from nutrifit.utils.storage import ValidationError
-        
         # Create an invalid progress entry (negative weight)
         invalid_entry = ProgressEntry(
             date=date.today(),
@@ -330,6 +332,16 @@ class TestStorageErrorHandling:
         with pytest.raises(ValidationError):
             temp_storage.add_progress_entry(invalid_entry, "test_user")
 
+    def test_invalid_batch_leaves_tracker_unchanged(self, temp_storage):
+        """Test that one invalid entry rejects the whole batch."""
+        valid_entry = ProgressEntry(date=date.today(), weight_kg=70.0)
+        invalid_entry = ProgressEntry(date=date.today(), weight_kg=-10.0)
+
+        with pytest.raises(ValidationError):
+            temp_storage.add_progress_entries([valid_entry, invalid_entry], "test_user")
+
+        assert temp_storage.load_progress_tracker("test_user") is None
+
     def test_atomic_write_on_save(self, temp_storage):
         """Test that saves are atomic (use temporary file)."""
         profile = UserProfile(
@@ -351,8 +363,6 @@ class TestStorageErrorHandling:
 
     def test_graceful_degradation_on_export(self, temp_storage):
         """Test that export continues even if some files are corrupted."""
-        from nutrifit.models.plan import MealPlan
-        
         # Save a valid user profile
         profile = UserProfile(
             name="Test User",